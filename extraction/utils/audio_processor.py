@@ -306,6 +306,27 @@ def download_video_with_ytdlp(video_url: str, output_path: str) -> str:
         raise RuntimeError(f"Failed to download video: {str(e)}")
 
 
+def convert_video_file_to_audio_file(video_path: str, audio_path: str) -> Optional[bytes]:
+    """
+    Convert an already-downloaded video into an MP3 on disk and thumbnail bytes.
+    The audio stays on disk so callers can stream it to storage.
+    """
+    extract_audio_to_mp3(video_path, audio_path)
+
+    thumbnail_bytes = None
+    try:
+        thumbnail_bytes = extract_thumbnail(video_path)
+    except Exception as e:
+        logger.warning(f"Thumbnail extraction failed (non-fatal): {e}")
+        thumbnail_bytes = None
+
+    logger.info(f"Audio conversion complete. Size: {os.path.getsize(audio_path)} bytes")
+    if thumbnail_bytes:
+        logger.info(f"Thumbnail extracted. Size: {len(thumbnail_bytes)} bytes")
+
+    return thumbnail_bytes
+
+
 def convert_video_file_to_audio(video_path: str) -> Tuple[bytes, str, Optional[bytes]]:
     """
     Convert an already-downloaded video into audio bytes and thumbnail bytes.
@@ -315,23 +336,12 @@ def convert_video_file_to_audio(video_path: str) -> Tuple[bytes, str, Optional[b
     audio_file.close()
 
     try:
-        extract_audio_to_mp3(video_path, audio_path)
-
-        thumbnail_bytes = None
-        try:
-            thumbnail_bytes = extract_thumbnail(video_path)
-        except Exception as e:
-            logger.warning(f"Thumbnail extraction failed (non-fatal): {e}")
-            thumbnail_bytes = None
+        thumbnail_bytes = convert_video_file_to_audio_file(video_path, audio_path)
 
         with open(audio_path, 'rb') as f:
             audio_bytes = f.read()
 
         filename = f"video_audio_{os.path.basename(audio_path)}"
-        logger.info(f"Audio conversion complete. Size: {len(audio_bytes)} bytes")
-        if thumbnail_bytes:
-            logger.info(f"Thumbnail extracted. Size: {len(thumbnail_bytes)} bytes")
-
         return audio_bytes, filename, thumbnail_bytes
     finally:
         if os.path.exists(audio_path):
@@ -11,7 +11,7 @@ from utils.job_models import (
     store_transcription, store_analysis, store_embedding
 )
 from utils.platform_router import PlatformRouter
-from utils.audio_processor import convert_video_file_to_audio
+from utils.audio_processor import convert_video_file_to_audio_file
 from utils.supabase_client import upload_audio_file, upload_thumbnail
 from utils.platform_detector import detect_platform
 from utils.transcription_service import transcribe_audio
@@ -81,33 +81,37 @@ def process_audio_job(job_id: str, url: str):
         try:
             download_target = os.path.join(temp_dir, f"{job_id}")
             downloaded_path = handler.download_video(url, download_target, metadata=metadata)
-            audio_bytes, filename, thumbnail_bytes = convert_video_file_to_audio(downloaded_path)
+            # The MP3 stays in temp_dir and is streamed to storage rather than read into memory
+            audio_path = os.path.join(temp_dir, "audio.mp3")
+            thumbnail_bytes = convert_video_file_to_audio_file(downloaded_path, audio_path)
+            
+            # Step 4: Upload thumbnail to Supabase
+            thumbnail_url = None
+            if thumbnail_bytes:
+                try:
+                    update_job_status(job_id, JobStatus.UPLOADING)
+                    thumbnail_url = upload_thumbnail(thumbnail_bytes, job_id)
+                    store_thumbnail(job_id, thumbnail_url)
+                    logger.info(f"Thumbnail uploaded: {thumbnail_url}")
+                except Exception as e:
+                    logger.warning(f"Thumbnail upload failed (non-fatal): {e}")
+            
+            # Step 5: Upload audio to Supabase
+            update_job_status(job_id, JobStatus.UPLOADING)
+            audio_url, audio_file_path = upload_audio_file(audio_path, os.path.basename(audio_path), job_id)
+            audio_size = os.path.getsize(audio_path)
         finally:
             try:
                 shutil.rmtree(temp_dir, ignore_errors=True)
             except Exception as cleanup_error:
                 logger.warning(f"Failed to delete {platform_name} temp directory {temp_dir}: {cleanup_error}")
         
-        # Step 4: Upload thumbnail to Supabase
-        thumbnail_url = None
-        if thumbnail_bytes:
-            try:
-                update_job_status(job_id, JobStatus.UPLOADING)
-                thumbnail_url = upload_thumbnail(thumbnail_bytes, job_id)
-                store_thumbnail(job_id, thumbnail_url)
-                logger.info(f"Thumbnail uploaded: {thumbnail_url}")
-            except Exception as e:
-                logger.warning(f"Thumbnail upload failed (non-fatal): {e}")
-        
-        # Step 5: Upload audio to Supabase
-        update_job_status(job_id, JobStatus.UPLOADING)
-        audio_url, audio_file_path = upload_audio_file(audio_bytes, filename, job_id)
         audio_file_id = store_audio_file(
             job_id=job_id,
             file_path=audio_file_path,  # Store actual file path
             supabase_url=audio_url,  # Store storage reference
             duration=duration,
-            size_bytes=len(audio_bytes)
+            size_bytes=audio_size
         )
         logger.info(f"Audio uploaded: {audio_file_path} (ref: {audio_url})")
         
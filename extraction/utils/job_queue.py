@@ -2,17 +2,47 @@
 # Handles Redis connection and RQ queue initialization for async job processing
 
 import logging
+import socket
 from typing import Optional
-from redis import Redis
+from redis import BlockingConnectionPool, ConnectionPool, Redis
 from rq import Queue
 from utils.config import config
 
 logger = logging.getLogger(__name__)
 
-# Global Redis connection and queue instances
+# Global Redis connection pool, connection and queue instances
+_redis_pool: Optional[ConnectionPool] = None
 _redis_conn: Optional[Redis] = None
 _job_queue: Optional[Queue] = None
 
+# How long a caller waits for a free pooled connection before ConnectionError
+_REDIS_POOL_TIMEOUT_SECONDS = 20
+
+
+def _get_redis_pool() -> ConnectionPool:
+    """
+    Get or create the process-wide Redis connection pool.
+    
+    Every caller (queue, worker, job status lookups) shares this pool, and
+    TCP keepalive stops idle sockets being dropped by NAT or load balancers.
+    When all connections are checked out, callers wait up to
+    _REDIS_POOL_TIMEOUT_SECONDS for one instead of failing immediately.
+    """
+    global _redis_pool
+    if _redis_pool is None:
+        keepalive_options = {}
+        # TCP_KEEPIDLE is Linux-only; macOS falls back to system keepalive timing
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            keepalive_options[socket.TCP_KEEPIDLE] = 60
+        _redis_pool = BlockingConnectionPool.from_url(
+            config.REDIS_URL,
+            max_connections=16,
+            timeout=_REDIS_POOL_TIMEOUT_SECONDS,
+            socket_keepalive=True,
+            socket_keepalive_options=keepalive_options
+        )
+    return _redis_pool
+
 
 def get_redis_connection() -> Redis:
     """
@@ -24,7 +54,7 @@ def get_redis_connection() -> Redis:
     global _redis_conn
     if _redis_conn is None:
         try:
-            _redis_conn = Redis.from_url(config.REDIS_URL)
+            _redis_conn = Redis(connection_pool=_get_redis_pool())
             # Test connection
             _redis_conn.ping()
             logger.info("Redis connection established")
@@ -1,23 +1,29 @@
 # Description: TikTok platform handler for validating URLs and fetching video metadata
 # Uses yt-dlp Python API to extract TikTok video metadata and video URLs
 
-import re
 import logging
 import os
 import shutil
-from typing import Dict, Optional
+import time
+from typing import Dict, Optional, Union
 
 from yt_dlp import YoutubeDL
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import TransportError
 
 from utils.platforms.base_handler import BasePlatformHandler
+from utils.regex_cache import TIKTOK_BYTES_PATTERNS, TIKTOK_PATTERNS, tiktok_extract_id
 
 logger = logging.getLogger(__name__)
 
+# Number of Range-resume attempts after the initial download stream fails
+_DOWNLOAD_RETRIES = 3
+
 
 class TikTokHandler(BasePlatformHandler):
     """TikTok platform handler for video metadata extraction."""
     
-    def validate_url(self, url: str) -> bool:
+    def validate_url(self, url: Union[str, bytes]) -> bool:
         """
         Validate if URL is a valid TikTok video URL.
         
@@ -27,23 +33,25 @@ class TikTokHandler(BasePlatformHandler):
         - https://vt.tiktok.com/...
         - https://www.tiktok.com/t/...
         """
-        if not url or not isinstance(url, str):
+        if not url:
             return False
         
-        url = url.strip().lower()
+        # Byte sources are matched directly against bytes patterns, without decoding
+        if isinstance(url, (bytes, bytearray)):
+            return any(pattern.search(url) for pattern in TIKTOK_BYTES_PATTERNS)
         
-        patterns = [
-            r'tiktok\.com/@[\w.-]+/video/\d+',
-            r'vm\.tiktok\.com/[\w]+',
-            r'vt\.tiktok\.com/[\w]+',
-            r'tiktok\.com/t/[\w]+',
-        ]
+        if not isinstance(url, str):
+            return False
         
-        for pattern in patterns:
-            if re.search(pattern, url):
-                return True
+        return self._validate_normalized(url.strip())
+    
+    def _validate_normalized(self, url: str) -> bool:
+        """
+        Validate an already-stripped URL.
         
-        return False
+        Shared patterns are case-insensitive, so no lowercased copy is needed.
+        """
+        return any(pattern.search(url) for pattern in TIKTOK_PATTERNS)
     
     def extract_id(self, url: str) -> str:
         """
@@ -58,27 +66,19 @@ class TikTokHandler(BasePlatformHandler):
         Raises:
             ValueError: If URL is invalid
         """
-        if not self.validate_url(url):
+        if not url or not isinstance(url, str):
             raise ValueError("Invalid TikTok URL. Please provide a valid TikTok video URL.")
         
-        # Extract ID from different URL formats
+        # Strip once and reuse for both validation and extraction
         url = url.strip()
+        if not self._validate_normalized(url):
+            raise ValueError("Invalid TikTok URL. Please provide a valid TikTok video URL.")
         
-        # Format: tiktok.com/@user/video/ID
-        match = re.search(r'tiktok\.com/@[\w.-]+/video/(\d+)', url, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        
-        # For short links (vm.tiktok.com, vt.tiktok.com), we'll need to resolve them
-        # For now, return a placeholder - yt-dlp will handle the resolution
-        match = re.search(r'(vm|vt)\.tiktok\.com/([\w]+)', url, re.IGNORECASE)
-        if match:
-            return match.group(2)
-        
-        # Format: tiktok.com/t/ID
-        match = re.search(r'tiktok\.com/t/([\w]+)', url, re.IGNORECASE)
-        if match:
-            return match.group(1)
+        # Handles tiktok.com/@user/video/ID, short links (vm/vt.tiktok.com) and tiktok.com/t/ID.
+        # Short-link codes are returned as-is; yt-dlp will handle the resolution
+        video_id = tiktok_extract_id(url)
+        if video_id:
+            return video_id
         
         raise ValueError("Could not extract video ID from TikTok URL")
     
@@ -125,7 +125,10 @@ class TikTokHandler(BasePlatformHandler):
             "http_headers": {
                 "Referer": "https://www.tiktok.com/",
                 "Origin": "https://www.tiktok.com",
+                "Connection": "keep-alive",
             },
+            "retries": 3,
+            "socket_timeout": 15,
         }
         
         try:
@@ -210,6 +213,34 @@ class TikTokHandler(BasePlatformHandler):
         """Get platform name."""
         return "TikTok"
 
+    def _copy_with_resume(self, ydl: YoutubeDL, download_url: str, f) -> None:
+        """
+        Stream download_url into f, resuming with a Range request after transient failures.
+
+        If the CDN ignores the Range header and answers 200, the partial file is
+        discarded and the download restarts from the beginning.
+        """
+        download_stream = ydl.urlopen(download_url)
+        for attempt in range(_DOWNLOAD_RETRIES + 1):
+            try:
+                shutil.copyfileobj(download_stream, f)
+                return
+            except (OSError, TransportError) as exc:
+                if attempt == _DOWNLOAD_RETRIES:
+                    raise
+                offset = f.tell()
+                logger.warning(
+                    "TikTokHandler.download_video: stream interrupted at %d bytes (%s), resuming (attempt %d/%d)",
+                    offset, exc, attempt + 1, _DOWNLOAD_RETRIES
+                )
+                time.sleep(0.5 * 2 ** attempt)
+                download_stream = ydl.urlopen(
+                    Request(download_url, headers={'Range': f'bytes={offset}-'})
+                )
+                if download_stream.status != 206:
+                    f.seek(0)
+                    f.truncate()
+
     def download_video(self, url: str, output_path: str, metadata: Optional[Dict] = None) -> str:
         """
         Download TikTok video using yt-dlp Python API to preserve session context.
@@ -247,9 +278,15 @@ class TikTokHandler(BasePlatformHandler):
             "http_headers": {
                 "Referer": "https://www.tiktok.com/",
                 "Origin": "https://www.tiktok.com",
+                "Connection": "keep-alive",
             },
             # Prefer combined formats to avoid muxing complexity
             "format": "bv*+ba/best",
+            # Ride out transient CDN errors instead of failing the whole job
+            "retries": 3,
+            "fragment_retries": 3,
+            "socket_timeout": 15,
+            "http_chunk_size": 1048576,
         }
 
         try:
@@ -265,9 +302,8 @@ class TikTokHandler(BasePlatformHandler):
                 target_path = f"{output_base}.{ext}"
 
                 logger.info("TikTokHandler.download_video: streaming download via YoutubeDL.urlopen")
-                download_stream = ydl.urlopen(download_url)
                 with open(target_path, 'wb') as f:
-                    shutil.copyfileobj(download_stream, f)
+                    self._copy_with_resume(ydl, download_url, f)
 
             file_size = os.path.getsize(target_path)
             logger.info("TikTokHandler.download_video: downloaded file %s (%d bytes)", target_path, file_size)
@@ -1,12 +1,9 @@
 # Description: YouTube Shorts platform handler for validating URLs and fetching video metadata
 # Uses yt-dlp to extract YouTube Shorts video metadata and video URLs
 
-import re
 import logging
 import os
-from typing import Dict, Optional
-
-import glob
+from typing import Dict, Optional, Union
 
 path_env = os.environ.get("PATH", "")
 if "/opt/homebrew/bin" not in path_env.split(":"):
@@ -15,6 +12,7 @@ os.environ.setdefault("YT_DLP_JS_ENGINE", "node")
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import DownloadError
 from utils.platforms.base_handler import BasePlatformHandler
+from utils.regex_cache import YT_BYTES_PATTERNS, YT_PATTERNS, yt_extract_id
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +20,7 @@ logger = logging.getLogger(__name__)
 class YouTubeHandler(BasePlatformHandler):
     """YouTube Shorts platform handler for video metadata extraction."""
     
-    def validate_url(self, url: str) -> bool:
+    def validate_url(self, url: Union[str, bytes]) -> bool:
         """
         Validate if URL is a valid YouTube Shorts URL.
         
@@ -31,22 +29,25 @@ class YouTubeHandler(BasePlatformHandler):
         - https://youtu.be/VIDEO_ID (will check if it's a short)
         - https://www.youtube.com/watch?v=VIDEO_ID (will check if it's a short)
         """
-        if not url or not isinstance(url, str):
+        if not url:
             return False
         
-        url = url.strip().lower()
+        # Byte sources are matched directly against bytes patterns, without decoding
+        if isinstance(url, (bytes, bytearray)):
+            return any(pattern.search(url) for pattern in YT_BYTES_PATTERNS)
         
-        patterns = [
-            r'youtube\.com/shorts/[\w-]+',
-            r'youtu\.be/[\w-]+',
-            r'youtube\.com/watch\?v=[\w-]+',
-        ]
+        if not isinstance(url, str):
+            return False
         
-        for pattern in patterns:
-            if re.search(pattern, url):
-                return True
+        return self._validate_normalized(url.strip())
+    
+    def _validate_normalized(self, url: str) -> bool:
+        """
+        Validate an already-stripped URL.
         
-        return False
+        Shared patterns are case-insensitive, so no lowercased copy is needed.
+        """
+        return any(pattern.search(url) for pattern in YT_PATTERNS)
     
     def extract_id(self, url: str) -> str:
         """
@@ -61,25 +62,18 @@ class YouTubeHandler(BasePlatformHandler):
         Raises:
             ValueError: If URL is invalid
         """
-        if not self.validate_url(url):
+        if not url or not isinstance(url, str):
             raise ValueError("Invalid YouTube URL. Please provide a valid YouTube Shorts URL.")
         
+        # Strip once and reuse for both validation and extraction
         url = url.strip()
+        if not self._validate_normalized(url):
+            raise ValueError("Invalid YouTube URL. Please provide a valid YouTube Shorts URL.")
         
-        # Format: youtube.com/shorts/ID
-        match = re.search(r'youtube\.com/shorts/([\w-]+)', url, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        
-        # Format: youtu.be/ID
-        match = re.search(r'youtu\.be/([\w-]+)', url, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        
-        # Format: youtube.com/watch?v=ID
-        match = re.search(r'youtube\.com/watch\?v=([\w-]+)', url, re.IGNORECASE)
-        if match:
-            return match.group(1)
+        # Handles youtube.com/shorts/ID, youtu.be/ID and youtube.com/watch?v=ID
+        video_id = yt_extract_id(url)
+        if video_id:
+            return video_id
         
         raise ValueError("Could not extract video ID from YouTube URL")
     
@@ -110,6 +104,8 @@ class YouTubeHandler(BasePlatformHandler):
             "no_warnings": False,
             "noprogress": True,
             "skip_download": True,
+            "retries": 3,
+            "socket_timeout": 15,
             "user_agent": (
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                 "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -197,6 +193,11 @@ class YouTubeHandler(BasePlatformHandler):
             "outtmpl": f"{output_base}.%(ext)s",
             "format": "18/best[ext=mp4]/best",
             "merge_output_format": "mp4",
+            # Ride out transient CDN errors instead of failing the whole job
+            "retries": 3,
+            "fragment_retries": 3,
+            "socket_timeout": 15,
+            "http_chunk_size": 1048576,
             "user_agent": (
                 "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                 "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
@@ -210,15 +211,26 @@ class YouTubeHandler(BasePlatformHandler):
                 # prepare_filename returns the remuxed filename if merge occurred
                 target_path = ydl.prepare_filename(info)
 
-            if not target_path or not os.path.exists(target_path):
-                # fallback: check for files matching output_base.*
-                candidates = glob.glob(f"{output_base}.*")
-                logger.info("YouTubeHandler.download_video: candidates %s", candidates)
+            # Single stat call covers both the existence check and the size lookup
+            target_stat = None
+            if target_path:
+                try:
+                    target_stat = os.stat(target_path)
+                except FileNotFoundError:
+                    target_stat = None
+
+            if target_stat is None:
+                # fallback: check for files matching output_base.* with one directory scan
+                base_dir, base_name = os.path.split(output_base)
+                prefix = base_name + '.'
+                with os.scandir(base_dir or '.') as entries:
+                    candidates = [(entry.path, entry.stat()) for entry in entries if entry.name.startswith(prefix)]
+                logger.info("YouTubeHandler.download_video: candidates %s", [path for path, _ in candidates])
                 if not candidates:
                     raise RuntimeError("YouTube download failed: no file produced")
-                target_path = max(candidates, key=os.path.getmtime)
+                target_path, target_stat = max(candidates, key=lambda item: item[1].st_mtime)
 
-            file_size = os.path.getsize(target_path)
+            file_size = target_stat.st_size
             logger.info("YouTubeHandler.download_video: downloaded file %s (%d bytes)", target_path, file_size)
 
             if file_size == 0:
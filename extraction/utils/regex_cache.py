@@ -0,0 +1,68 @@
+# Description: Shared precompiled URL patterns for platform handlers
+# Patterns are compiled once at import and reused by every handler for the life of the process
+
+import re
+from typing import Iterable, Optional, Pattern
+
+# TikTok patterns
+# - tiktok.com/@user/video/ID
+# - vm.tiktok.com/CODE and vt.tiktok.com/CODE short links
+# - tiktok.com/t/CODE
+TIKTOK_LONG = re.compile(r'tiktok\.com/@[\w.-]+/video/(\d+)', re.IGNORECASE)
+TIKTOK_VM = re.compile(r'(?:vm|vt)\.tiktok\.com/(\w+)', re.IGNORECASE)
+TIKTOK_T = re.compile(r'tiktok\.com/t/(\w+)', re.IGNORECASE)
+TIKTOK_PATTERNS = (TIKTOK_LONG, TIKTOK_VM, TIKTOK_T)
+
+# YouTube patterns
+# - youtube.com/shorts/ID
+# - youtu.be/ID
+# - youtube.com/watch?v=ID
+YT_SHORTS = re.compile(r'youtube\.com/shorts/([\w-]+)', re.IGNORECASE)
+YT_SHORT = re.compile(r'youtu\.be/([\w-]+)', re.IGNORECASE)
+YT_WATCH = re.compile(r'youtube\.com/watch\?v=([\w-]+)', re.IGNORECASE)
+YT_PATTERNS = (YT_SHORTS, YT_SHORT, YT_WATCH)
+
+
+def _bytes_variant(pattern: Pattern) -> Pattern:
+    """Compile a bytes twin of a str pattern so byte sources skip decoding."""
+    return re.compile(pattern.pattern.encode('ascii'), pattern.flags & ~re.UNICODE)
+
+
+# Bytes twins, for URLs that arrive as raw bytes (HTTP bodies, queue payloads)
+TIKTOK_BYTES_PATTERNS = tuple(_bytes_variant(pattern) for pattern in TIKTOK_PATTERNS)
+YT_BYTES_PATTERNS = tuple(_bytes_variant(pattern) for pattern in YT_PATTERNS)
+
+
+def _first_group(patterns: Iterable[Pattern], url: str) -> Optional[str]:
+    """Return the first capture group of the first pattern that matches url."""
+    for pattern in patterns:
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+
+def tiktok_extract_id(url: str) -> Optional[str]:
+    """
+    Extract the TikTok video ID (or short-link code) from a URL.
+
+    Args:
+        url: TikTok video URL
+
+    Returns:
+        Video ID or short-link code, or None if no pattern matches
+    """
+    return _first_group(TIKTOK_PATTERNS, url)
+
+
+def yt_extract_id(url: str) -> Optional[str]:
+    """
+    Extract the YouTube video ID from a URL.
+
+    Args:
+        url: YouTube video URL
+
+    Returns:
+        Video ID, or None if no pattern matches
+    """
+    return _first_group(YT_PATTERNS, url)
@@ -3,15 +3,35 @@
 # for managing audio files and thumbnails
 
 import logging
-from typing import Optional
-from datetime import datetime
-from supabase import create_client, Client
+import os
+import time
+import uuid
+from functools import lru_cache
+from typing import BinaryIO, Optional, Union
+import httpx
+from supabase import create_client, Client, ClientOptions
 from utils.config import config
 
 logger = logging.getLogger(__name__)
 
 # Initialize Supabase client
 _supabase_client: Optional[Client] = None
+_storage_http_client: Optional[httpx.Client] = None
+
+# Keep-alive pool for storage uploads; HTTP/2 lets concurrent uploads multiplex on one connection
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=32, keepalive_expiry=60)
+
+# Each sub-client (PostgREST, storage) keeps its own httpx client and base URL;
+# only their timeouts are overridden
+_SUPABASE_TIMEOUT_SECONDS = 60
+
+# URL prefixes never change after config is loaded, so build them once
+_PUBLIC_URL_PREFIX = f"{config.SUPABASE_URL}/storage/v1/object/public/"
+_INTERNAL_REF_PREFIX = "supabase://"
+
+# Signed URLs are valid for an hour; cached ones are refreshed well before that
+_SIGNED_URL_EXPIRY_SECONDS = 3600
+_SIGNED_URL_REFRESH_SECONDS = 3000
 
 
 def _guess_content_type(file_path: str) -> str:
@@ -28,6 +48,24 @@ def _guess_content_type(file_path: str) -> str:
     return 'application/octet-stream'
 
 
+def _storage_url(bucket_name: str, file_path: str, is_public: bool) -> str:
+    """
+    Build the URL returned for an uploaded object.
+    Public buckets get a direct HTTP URL; private ones an internal supabase:// reference.
+    """
+    if is_public:
+        return _PUBLIC_URL_PREFIX + bucket_name + '/' + file_path
+    return _INTERNAL_REF_PREFIX + bucket_name + '/' + file_path
+
+
+def _unique_file_suffix() -> str:
+    """
+    Build a UTC timestamp plus random suffix for object names.
+    The random part keeps two uploads for the same job in the same second from colliding.
+    """
+    return f"{time.strftime('%Y%m%d_%H%M%S', time.gmtime())}_{uuid.uuid4().hex[:8]}"
+
+
 def get_supabase_client() -> Client:
     """
     Get or create Supabase client instance.
@@ -39,16 +77,46 @@ def get_supabase_client() -> Client:
     if _supabase_client is None:
         _supabase_client = create_client(
             config.SUPABASE_URL,
-            config.SUPABASE_SERVICE_ROLE_KEY
+            config.SUPABASE_SERVICE_ROLE_KEY,
+            options=ClientOptions(
+                postgrest_client_timeout=_SUPABASE_TIMEOUT_SECONDS,
+                storage_client_timeout=_SUPABASE_TIMEOUT_SECONDS
+            )
         )
         logger.info("Supabase client initialized")
     return _supabase_client
 
 
+def get_storage_http_client() -> httpx.Client:
+    """
+    Get or create the HTTP client used for storage uploads.
+    
+    It talks to the Storage REST API only and is not shared with the
+    Supabase client's sub-clients, so its base URL is never rewritten.
+    
+    Returns:
+        httpx Client with HTTP/2 and a pooled keep-alive connection limit
+    """
+    global _storage_http_client
+    if _storage_http_client is None:
+        _storage_http_client = httpx.Client(
+            base_url=f"{config.SUPABASE_URL}/storage/v1",
+            http2=True,
+            limits=_HTTP_LIMITS,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            headers={
+                "Authorization": f"Bearer {config.SUPABASE_SERVICE_ROLE_KEY}",
+                "apikey": config.SUPABASE_SERVICE_ROLE_KEY,
+            }
+        )
+        logger.info("Storage HTTP client initialized")
+    return _storage_http_client
+
+
 def upload_file_to_bucket(
     bucket_name: str,
     file_path: str,
-    file_data: bytes,
+    file_data: Union[bytes, BinaryIO],
     *,
     content_type: Optional[str] = None,
     is_public: bool = False
@@ -59,7 +127,7 @@ def upload_file_to_bucket(
     Args:
         bucket_name: Name of the storage bucket
         file_path: Path within the bucket (e.g., "audio/job_123.mp3")
-        file_data: File content as bytes
+        file_data: File content as bytes or an open binary file handle
         content_type: MIME type of the file (optional)
         
     Returns:
@@ -69,25 +137,24 @@ def upload_file_to_bucket(
         RuntimeError: If upload fails
     """
     try:
-        client = get_supabase_client()
+        client = get_storage_http_client()
         
         resolved_content_type = content_type or _guess_content_type(file_path)
         
         logger.info(f"Uploading file to bucket '{bucket_name}' at path '{file_path}'")
         
-        client.storage.from_(bucket_name).upload(
-            path=file_path,
-            file=file_data,
-            file_options={
+        # Uploads from concurrent jobs share the pooled HTTP/2 connection
+        response = client.post(
+            f"/object/{bucket_name}/{file_path}",
+            content=file_data,
+            headers={
                 "content-type": resolved_content_type,
-                "upsert": "true"
+                "x-upsert": "true"
             }
         )
+        response.raise_for_status()
         
-        if is_public:
-            public_url = f"{config.SUPABASE_URL}/storage/v1/object/public/{bucket_name}/{file_path}"
-        else:
-            public_url = f"supabase://{bucket_name}/{file_path}"
+        public_url = _storage_url(bucket_name, file_path, is_public)
         
         logger.info(f"File uploaded successfully. Path: {file_path}, URL: {public_url}")
         return public_url
@@ -97,8 +164,73 @@ def upload_file_to_bucket(
         raise RuntimeError(f"Failed to upload file to Supabase: {str(e)}")
 
 
+def upload_file_path_to_bucket(
+    bucket_name: str,
+    file_path: str,
+    local_path: Union[str, os.PathLike],
+    *,
+    content_type: Optional[str] = None,
+    is_public: bool = False
+) -> str:
+    """
+    Upload a local file to Supabase Storage without reading it into memory.
+    
+    The open file handle is forwarded to the storage client, which streams it
+    in chunks, so memory use stays constant regardless of file size.
+    
+    Args:
+        bucket_name: Name of the storage bucket
+        file_path: Path within the bucket (e.g., "audio/job_123.mp3")
+        local_path: Path of the file on local disk
+        content_type: MIME type of the file (optional)
+        
+    Returns:
+        Public URL for public buckets or an internal Supabase reference
+        
+    Raises:
+        RuntimeError: If upload fails
+    """
+    with open(local_path, 'rb') as fh:
+        return upload_file_to_bucket(
+            bucket_name=bucket_name,
+            file_path=file_path,
+            file_data=fh,
+            content_type=content_type,
+            is_public=is_public
+        )
+
+
+def _upload_source(
+    bucket_name: str,
+    file_path: str,
+    source: Union[bytes, str, os.PathLike],
+    *,
+    content_type: str,
+    is_public: bool
+) -> str:
+    """
+    Upload in-memory bytes or stream a local file, depending on what the caller has.
+    Paths are preferred since they avoid holding the whole file in memory.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return upload_file_to_bucket(
+            bucket_name=bucket_name,
+            file_path=file_path,
+            file_data=source,
+            content_type=content_type,
+            is_public=is_public
+        )
+    return upload_file_path_to_bucket(
+        bucket_name=bucket_name,
+        file_path=file_path,
+        local_path=source,
+        content_type=content_type,
+        is_public=is_public
+    )
+
+
 def upload_audio_file(
-    audio_bytes: bytes,
+    audio_source: Union[bytes, str, os.PathLike],
     filename: str,
     job_id: str,
     *,
@@ -109,7 +241,7 @@ def upload_audio_file(
     Upload audio file to configured Supabase audio bucket (private by default).
     
     Args:
-        audio_bytes: Audio file content as bytes
+        audio_source: Audio file content as bytes, or a local file path to stream from
         filename: Original filename (for extension detection)
         job_id: Job ID for unique file naming
         
@@ -118,18 +250,17 @@ def upload_audio_file(
         - storage_reference: Supabase storage reference (supabase://bucket/path)
         - file_path: Actual file path in bucket
     """
-    # Generate unique filename: {job_id}_{timestamp}.mp3
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    file_path = f"{job_id}_{timestamp}.mp3"
+    # Generate unique filename: {job_id}_{timestamp}_{suffix}.mp3
+    file_path = f"{job_id}_{_unique_file_suffix()}.mp3"
     
     logger.info(f"Uploading audio file for job {job_id}: {file_path}")
     
     target_bucket = bucket_name or config.SUPABASE_AUDIO_BUCKET
     
-    storage_ref = upload_file_to_bucket(
-        bucket_name=target_bucket,
-        file_path=file_path,
-        file_data=audio_bytes,
+    storage_ref = _upload_source(
+        target_bucket,
+        file_path,
+        audio_source,
         content_type="audio/mpeg",
         is_public=is_public
     )
@@ -138,7 +269,7 @@ def upload_audio_file(
 
 
 def upload_thumbnail(
-    thumbnail_bytes: bytes,
+    thumbnail_source: Union[bytes, str, os.PathLike],
     job_id: str,
     *,
     bucket_name: Optional[str] = None,
@@ -148,24 +279,23 @@ def upload_thumbnail(
     Upload thumbnail image to configured Supabase thumbnail bucket (public by default).
     
     Args:
-        thumbnail_bytes: Thumbnail image content as bytes
+        thumbnail_source: Thumbnail image content as bytes, or a local file path to stream from
         job_id: Job ID for unique file naming
         
     Returns:
         Supabase storage URL of the uploaded thumbnail
     """
-    # Generate unique filename: {job_id}_{timestamp}.jpg
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    file_path = f"{job_id}_{timestamp}.jpg"
+    # Generate unique filename: {job_id}_{timestamp}_{suffix}.jpg
+    file_path = f"{job_id}_{_unique_file_suffix()}.jpg"
     
     logger.info(f"Uploading thumbnail for job {job_id}: {file_path}")
     
     target_bucket = bucket_name or config.SUPABASE_THUMBNAIL_BUCKET
     
-    return upload_file_to_bucket(
-        bucket_name=target_bucket,
-        file_path=file_path,
-        file_data=thumbnail_bytes,
+    return _upload_source(
+        target_bucket,
+        file_path,
+        thumbnail_source,
         content_type="image/jpeg",
         is_public=is_public
     )
@@ -205,18 +335,32 @@ def get_public_url(
         file_path: Path within the bucket
         
     Returns:
-        Public URL of the file
+        Public URL of the file, or a signed URL for private buckets
     """
-    client = get_supabase_client()
     public_bucket = (
         is_public_bucket if is_public_bucket is not None
         else bucket_name == config.SUPABASE_THUMBNAIL_BUCKET
     )
 
     if public_bucket:
-        return f"{config.SUPABASE_URL}/storage/v1/object/public/{bucket_name}/{file_path}"
+        return _storage_url(bucket_name, file_path, True)
+
+    # Private buckets need a signed URL; reuse one while it is still comfortably valid
+    return _signed_url(bucket_name, file_path, int(time.time() // _SIGNED_URL_REFRESH_SECONDS))
+
 
-        return client.storage.from_(bucket_name).create_signed_url(file_path, 3600)['signedURL']
+@lru_cache(maxsize=512)
+def _signed_url(bucket_name: str, file_path: str, refresh_window: int) -> str:
+    """
+    Create a signed URL for a private object.
+    
+    refresh_window is part of the cache key only: it changes every
+    _SIGNED_URL_REFRESH_SECONDS, so cached URLs are never served past their expiry.
+    """
+    client = get_supabase_client()
+    return client.storage.from_(bucket_name).create_signed_url(
+        file_path, _SIGNED_URL_EXPIRY_SECONDS
+    )['signedURL']
 
 
 def download_file_from_bucket(bucket_name: str, file_path: str) -> bytes:
@@ -1,9 +1,13 @@
 # Description: Transcription service using OpenAI Whisper API
 # Converts audio files to text transcripts with language detection and timestamps
 
+import io
 import logging
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional
+from urllib3.util.retry import Retry
 from openai import OpenAI
 from utils.config import config
 from utils.supabase_client import download_file_from_bucket
@@ -13,6 +17,9 @@ logger = logging.getLogger(__name__)
 # Initialize OpenAI client
 _openai_client: Optional[OpenAI] = None
 
+# Shared HTTP session so repeated audio downloads reuse pooled connections
+_http_session: Optional[requests.Session] = None
+
 
 def get_openai_client() -> OpenAI:
     """
@@ -28,17 +35,41 @@ def get_openai_client() -> OpenAI:
     return _openai_client
 
 
-def download_audio_from_url(audio_url: str) -> bytes:
+def _get_session() -> requests.Session:
     """
-    Download audio file from URL or Supabase storage.
+    Get or create the shared HTTP session for audio downloads.
     
-    Handles both public URLs and Supabase storage references.
+    Returns:
+        requests Session with a pooled, retrying HTTP adapter
+    """
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _http_session = session
+        logger.info("HTTP session initialized")
+    return _http_session
+
+
+def download_audio_from_url(audio_url: str, buffer: Optional[io.BytesIO] = None) -> io.BytesIO:
+    """
+    Download audio file from URL or Supabase storage into an in-memory buffer.
+    
+    Handles both public URLs and Supabase storage references. HTTP downloads are
+    streamed chunk by chunk into the buffer, so the audio is held in memory once.
     
     Args:
         audio_url: URL to audio file or Supabase storage reference (supabase://bucket/path)
+        buffer: Optional buffer to fill; a new one is created if omitted
         
     Returns:
-        Audio file content as bytes
+        Buffer containing the audio, positioned at the start
     """
     try:
         # Check if this is a Supabase storage reference
@@ -50,14 +81,24 @@ def download_audio_from_url(audio_url: str) -> bytes:
                 logger.info(f"Downloading audio from Supabase bucket '{bucket_name}': {file_path}")
                 audio_bytes = download_file_from_bucket(bucket_name, file_path)
                 logger.info(f"Audio downloaded from Supabase. Size: {len(audio_bytes)} bytes")
-                return audio_bytes
+                if buffer is None:
+                    # BytesIO shares the bytes object until written to, so this does not copy
+                    return io.BytesIO(audio_bytes)
+                buffer.write(audio_bytes)
+                buffer.seek(0)
+                return buffer
         
         # Regular HTTP URL
         logger.info(f"Downloading audio from URL: {audio_url[:50]}...")
-        response = requests.get(audio_url, timeout=300)  # 5 minute timeout for large files
-        response.raise_for_status()
-        logger.info(f"Audio downloaded. Size: {len(response.content)} bytes")
-        return response.content
+        if buffer is None:
+            buffer = io.BytesIO()
+        with _get_session().get(audio_url, timeout=300, stream=True) as response:  # 5 minute timeout for large files
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=1 << 16):
+                buffer.write(chunk)
+        logger.info(f"Audio downloaded. Size: {buffer.tell()} bytes")
+        buffer.seek(0)
+        return buffer
     except Exception as e:
         logger.error(f"Failed to download audio: {e}")
         raise RuntimeError(f"Failed to download audio: {str(e)}")
@@ -82,15 +123,17 @@ def transcribe_audio(audio_url: str) -> Dict:
     try:
         logger.info(f"Starting transcription for audio: {audio_url[:50]}...")
         
-        # Download audio file
-        audio_bytes = download_audio_from_url(audio_url)
-        
-        # Initialize OpenAI client
-        client = get_openai_client()
+        if _openai_client is None:
+            # First call in this process: build the OpenAI client while the audio downloads
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                client_future = executor.submit(get_openai_client)
+                audio_file = download_audio_from_url(audio_url)
+                client = client_future.result()
+        else:
+            client = get_openai_client()
+            audio_file = download_audio_from_url(audio_url)
         
-        # Create a temporary file-like object for OpenAI API
-        import io
-        audio_file = io.BytesIO(audio_bytes)
+        # Download went straight into the buffer handed to the OpenAI API
         audio_file.name = "audio.mp3"  # OpenAI needs a filename
         
         # Call OpenAI Whisper API
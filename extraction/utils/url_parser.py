@@ -4,6 +4,13 @@
 import re
 from typing import Optional
 
+# Pattern to match Instagram Reel URLs, compiled once at import
+# Matches: instagram.com/reel/SHORTCODE, instagram.com/reels/SHORTCODE, or www.instagram.com/reel/SHORTCODE
+# Some reels use the /p/ format as well
+# Note: Instagram uses both /reel/ (singular) and /reels/ (plural) formats
+# Shortcodes are typically 11 characters (alphanumeric + underscore + hyphen); fewer than 5 is rejected
+_REEL_RE = re.compile(r'(?:https?://)?(?:www\.)?instagram\.com/(?:reels?|p)/([A-Za-z0-9_-]{5,})')
+
 
 def extract_reel_id(url: str) -> Optional[str]:
     """
@@ -32,23 +39,9 @@ def extract_reel_id(url: str) -> Optional[str]:
     # Remove query parameters and fragments (everything after ? or #)
     url = url.split('?')[0].split('#')[0].rstrip('/')
     
-    # Pattern to match Instagram Reel URLs
-    # Matches: instagram.com/reel/SHORTCODE, instagram.com/reels/SHORTCODE, or www.instagram.com/reel/SHORTCODE
-    # Also handles URLs with query parameters (removed above)
-    # Note: Instagram uses both /reel/ (singular) and /reels/ (plural) formats
-    patterns = [
-        r'(?:https?://)?(?:www\.)?instagram\.com/reels/([A-Za-z0-9_-]+)',  # /reels/ (plural) format
-        r'(?:https?://)?(?:www\.)?instagram\.com/reel/([A-Za-z0-9_-]+)',   # /reel/ (singular) format
-        r'(?:https?://)?(?:www\.)?instagram\.com/p/([A-Za-z0-9_-]+)',      # Some reels use /p/ format
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            reel_id = match.group(1)
-            # Validate shortcode format (typically 11 characters, alphanumeric + underscore + hyphen)
-            if reel_id and len(reel_id) >= 5:
-                return reel_id
+    match = _REEL_RE.search(url)
+    if match:
+        return match.group(1)
     
     raise ValueError("Invalid Instagram Reel URL. Please provide a valid Instagram Reel URL.")
 
@@ -12,7 +12,7 @@ if sys.platform == 'darwin':  # macOS
     os.environ['OBJC_DISABLE_INITIALIZE_FORK_SAFETY'] = 'YES'
 
 import logging
-from rq import Worker
+from rq import Queue, SimpleWorker, Worker
 from utils.job_queue import get_redis_connection, get_job_queue
 
 # Configure logging
@@ -23,19 +23,52 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def prewarm():
+    """
+    Import the job pipeline and create API clients in the parent process.
+    
+    Forked job processes inherit these via copy-on-write instead of paying the
+    import and client construction cost on every job. Clients are only
+    constructed here; no connections are opened before the fork.
+    """
+    # Pulls in yt-dlp, platform handlers, OpenAI and Supabase modules
+    import utils.job_processor  # noqa: F401
+    from utils.supabase_client import get_supabase_client
+    from utils.transcription_service import get_openai_client
+    
+    get_supabase_client()
+    get_openai_client()
+    logger.info("Worker pre-warmed: pipeline modules imported and clients created")
+
+
 def start_worker():
     """Start RQ worker to process jobs."""
     try:
         redis_conn = get_redis_connection()
-        queue = get_job_queue()
+        queues = [get_job_queue()]
+        
+        # RQ_EXTRA_QUEUES=high,low drains extra queues (in priority order) from this same
+        # worker process, rather than starting one worker per queue
+        extra_queue_names = [
+            name.strip() for name in os.environ.get("RQ_EXTRA_QUEUES", "").split(",") if name.strip()
+        ]
+        queues += [Queue(name, connection=redis_conn) for name in extra_queue_names]
+        
+        prewarm()
+        
+        # RQ_WORKER_CLASS=SimpleWorker runs jobs in this process with no fork at all
+        worker_class = Worker
+        if os.environ.get("RQ_WORKER_CLASS", "").rsplit('.', 1)[-1] == "SimpleWorker":
+            worker_class = SimpleWorker
         
-        logger.info("Starting RQ worker...")
-        logger.info(f"Listening on queue: {queue.name}")
+        logger.info(f"Starting RQ worker ({worker_class.__name__})...")
+        logger.info(f"Listening on queues: {', '.join(queue.name for queue in queues)}")
         
-        # Create worker with connection and queue
+        # Create worker with connection and queues
         # In newer RQ versions, Worker takes connection and queues directly
-        worker = Worker([queue], connection=redis_conn)
-        worker.work()
+        worker = worker_class(queues, connection=redis_conn)
+        # Long-lived: keep pulling jobs in this process rather than exiting after a burst
+        worker.work(burst=False, with_scheduler=False, max_jobs=None)
             
     except KeyboardInterrupt:
         logger.info("Worker stopped by user")
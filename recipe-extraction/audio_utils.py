@@ -0,0 +1,305 @@
+"""
+Audio helpers for the recipe pipeline.
+Extracts audio from downloaded videos and splits it into chunks so Whisper
+can transcribe them concurrently.
+"""
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from utils.audio_processor import extract_thumbnail
+
+# webrtcvad lets chunks end on pauses in speech; without it audio is cut every CHUNK_SECONDS
+try:
+    import webrtcvad
+except ImportError:  # pragma: no cover - optional dependency
+    webrtcvad = None
+
+logger = logging.getLogger(__name__)
+
+# Length of each chunk sent to Whisper; short clips come back as a single chunk
+CHUNK_SECONDS = 30
+
+# Opus bitrate of extracted audio; also used to estimate a clip's length from its size
+_OPUS_BITRATE = 24000
+_OPUS_BYTES_PER_SECOND = _OPUS_BITRATE // 8
+
+# Voice activity detection works on 30 ms frames of 16 kHz, 16-bit mono PCM
+_VAD_SAMPLE_RATE = 16000
+_VAD_FRAME_MS = 30
+_VAD_FRAME_BYTES = _VAD_SAMPLE_RATE * 2 * _VAD_FRAME_MS // 1000
+_VAD_AGGRESSIVENESS = 2
+# A pause this long (in frames) ends a run of speech
+_VAD_MIN_SILENCE_FRAMES = 10
+
+
+def extract_audio_bytes(video_path: str) -> bytes:
+    """
+    Extract the audio track of a video as Opus/Ogg, read straight from ffmpeg's stdout.
+
+    Whisper resamples everything to 16 kHz mono, so the audio is downmixed
+    and encoded at 24 kbps; that is several times smaller than MP3 to upload
+    with no loss in transcription quality.
+
+    Args:
+        video_path: Path to input video file
+
+    Returns:
+        Ogg/Opus audio bytes
+
+    Raises:
+        RuntimeError: If the video has no audio, ffmpeg fails, or is not installed
+    """
+    cmd = [
+        'ffmpeg',
+        '-i', video_path,
+        '-vn',  # No video
+        '-ac', '1',  # Mono
+        '-ar', '16000',  # Whisper's native sample rate
+        '-c:a', 'libopus',
+        '-b:a', str(_OPUS_BITRATE),
+        '-f', 'ogg',
+        '-fflags', '+bitexact',  # Fixed Ogg serial numbers and tags: same video, same bytes
+        '-flags:a', '+bitexact',
+        'pipe:1'
+    ]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=120)
+    except subprocess.TimeoutExpired:
+        logger.error("ffmpeg processing timed out")
+        raise RuntimeError("Audio extraction timed out")
+    except FileNotFoundError:
+        logger.error("ffmpeg not found. Please install ffmpeg.")
+        raise RuntimeError("ffmpeg is not installed. Please install ffmpeg on your system.")
+
+    error_msg = result.stderr.decode('utf-8', errors='ignore')
+    if "does not contain any stream" in error_msg or "no audio streams" in error_msg.lower():
+        raise RuntimeError("This video has no audio stream. The Reel may be silent or the audio is not available.")
+
+    if result.returncode != 0:
+        logger.error(f"ffmpeg failed: {error_msg}")
+        raise RuntimeError(f"Failed to extract audio: {error_msg[-200:] or 'Unknown error'}")
+
+    if not result.stdout:
+        raise RuntimeError("This video has no audio stream. The Reel may be silent or the audio is not available.")
+
+    return result.stdout
+
+
+def extract_audio_and_thumbnail(video_path: str) -> Tuple[bytes, Optional[bytes]]:
+    """
+    Extract audio and a thumbnail from a downloaded video without temp files.
+
+    Both come back over ffmpeg pipes; a failed thumbnail is non-fatal.
+
+    Args:
+        video_path: Path to input video file
+
+    Returns:
+        Tuple of (audio_bytes, thumbnail_bytes or None)
+    """
+    audio_bytes = extract_audio_bytes(video_path)
+
+    thumbnail_bytes = None
+    try:
+        thumbnail_bytes = extract_thumbnail(video_path)
+    except Exception as e:
+        logger.warning(f"Thumbnail extraction failed (non-fatal): {e}")
+
+    return audio_bytes, thumbnail_bytes
+
+
+def split_audio_bytes(audio_bytes: bytes, chunk_seconds: int = CHUNK_SECONDS) -> List[bytes]:
+    """
+    Split Ogg/Opus audio into consecutive chunks of roughly chunk_seconds each.
+
+    Uses ffmpeg's segment muxer with stream copy, so frames are cut without
+    re-encoding. Audio shorter than one chunk is returned unchanged.
+
+    Args:
+        audio_bytes: Ogg/Opus audio content
+        chunk_seconds: Target length of each chunk in seconds
+
+    Returns:
+        List of Ogg/Opus chunks in playback order
+
+    Raises:
+        RuntimeError: If ffmpeg fails or is not installed
+    """
+    temp_dir = tempfile.mkdtemp(prefix="chunks_")
+    try:
+        pattern = os.path.join(temp_dir, "chunk_%04d.ogg")
+        cmd = [
+            'ffmpeg',
+            '-i', 'pipe:0',
+            '-f', 'segment',
+            '-segment_time', str(chunk_seconds),
+            '-c', 'copy',
+            '-y',
+            pattern
+        ]
+
+        result = subprocess.run(cmd, input=audio_bytes, capture_output=True, timeout=60)
+
+        if result.returncode != 0:
+            error_msg = result.stderr.decode('utf-8', errors='ignore') or "Unknown error"
+            logger.error(f"ffmpeg audio split failed: {error_msg}")
+            raise RuntimeError(f"Failed to split audio: {error_msg[:200]}")
+
+        names = sorted(os.listdir(temp_dir))
+        if len(names) <= 1:
+            return [audio_bytes]
+
+        chunks = []
+        for name in names:
+            with open(os.path.join(temp_dir, name), 'rb') as f:
+                chunks.append(f.read())
+
+        logger.info(f"Split audio into {len(chunks)} chunks of ~{chunk_seconds}s")
+        return chunks
+
+    except subprocess.TimeoutExpired:
+        logger.error("ffmpeg audio split timed out")
+        raise RuntimeError("Audio split timed out")
+    except FileNotFoundError:
+        logger.error("ffmpeg not found. Please install ffmpeg.")
+        raise RuntimeError("ffmpeg is not installed. Please install ffmpeg on your system.")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _run_ffmpeg_pipe(cmd: List[str], input_bytes: bytes, what: str) -> bytes:
+    """Run an ffmpeg command that reads stdin and writes stdout, raising RuntimeError on failure."""
+    try:
+        result = subprocess.run(cmd, input=input_bytes, capture_output=True, timeout=60)
+    except subprocess.TimeoutExpired:
+        logger.error(f"ffmpeg {what} timed out")
+        raise RuntimeError(f"Audio {what} timed out")
+    except FileNotFoundError:
+        logger.error("ffmpeg not found. Please install ffmpeg.")
+        raise RuntimeError("ffmpeg is not installed. Please install ffmpeg on your system.")
+
+    if result.returncode != 0:
+        error_msg = result.stderr.decode('utf-8', errors='ignore') or "Unknown error"
+        logger.error(f"ffmpeg {what} failed: {error_msg}")
+        raise RuntimeError(f"Failed to {what} audio: {error_msg[-200:]}")
+
+    return result.stdout
+
+
+def _speech_segments(pcm: bytes, max_frames: int) -> List[Tuple[int, int]]:
+    """
+    Group voiced frames into (start_frame, end_frame) segments of at most max_frames.
+
+    Runs of speech separated by short pauses are merged; a segment is closed
+    when adding the next run would exceed max_frames. Runs longer than
+    max_frames are cut into max_frames pieces. Leading/trailing silence and
+    long pauses are dropped.
+    """
+    vad = webrtcvad.Vad(_VAD_AGGRESSIVENESS)
+    frame_count = len(pcm) // _VAD_FRAME_BYTES
+
+    # Runs of speech, allowing pauses shorter than _VAD_MIN_SILENCE_FRAMES inside a run
+    runs: List[Tuple[int, int]] = []
+    run_start = None
+    silence = 0
+    for index in range(frame_count):
+        offset = index * _VAD_FRAME_BYTES
+        if vad.is_speech(pcm[offset:offset + _VAD_FRAME_BYTES], _VAD_SAMPLE_RATE):
+            if run_start is None:
+                run_start = index
+            silence = 0
+        elif run_start is not None:
+            silence += 1
+            if silence >= _VAD_MIN_SILENCE_FRAMES:
+                runs.append((run_start, index - silence + 1))
+                run_start = None
+                silence = 0
+    if run_start is not None:
+        runs.append((run_start, frame_count - silence))
+
+    segments: List[Tuple[int, int]] = []
+    for start, end in runs:
+        if segments and end - segments[-1][0] <= max_frames:
+            segments[-1] = (segments[-1][0], end)
+            continue
+        while end - start > max_frames:
+            segments.append((start, start + max_frames))
+            start += max_frames
+        segments.append((start, end))
+
+    return segments
+
+
+def split_audio_on_speech(audio_bytes: bytes, chunk_seconds: int = CHUNK_SECONDS) -> List[bytes]:
+    """
+    Split audio into chunks of at most chunk_seconds that start and end on pauses.
+
+    Decodes to 16 kHz PCM, finds speech with WebRTC VAD, and re-encodes each
+    group of speech as Opus/Ogg. Cuts never fall mid-word and silent stretches
+    are not sent to Whisper. Audio whose size at the extraction bitrate puts it
+    within one chunk is returned unchanged without decoding. Falls back to
+    split_audio_bytes when webrtcvad is not installed, and returns the audio
+    unchanged when it fits in one chunk or no speech is detected (e.g.
+    music-only clips).
+
+    Args:
+        audio_bytes: Ogg/Opus audio content
+        chunk_seconds: Maximum length of each chunk in seconds
+
+    Returns:
+        List of Ogg/Opus chunks in playback order
+
+    Raises:
+        RuntimeError: If ffmpeg fails or is not installed
+    """
+    # Most clips fit in one chunk; the Opus size tells us so without decoding.
+    # A clip just over the limit that is misjudged is sent whole, which Whisper accepts.
+    if len(audio_bytes) <= chunk_seconds * _OPUS_BYTES_PER_SECOND:
+        return [audio_bytes]
+
+    if webrtcvad is None:
+        return split_audio_bytes(audio_bytes, chunk_seconds)
+
+    pcm = _run_ffmpeg_pipe(
+        ['ffmpeg', '-i', 'pipe:0', '-f', 's16le', '-ac', '1', '-ar', str(_VAD_SAMPLE_RATE), 'pipe:1'],
+        audio_bytes,
+        "decode"
+    )
+
+    max_frames = chunk_seconds * 1000 // _VAD_FRAME_MS
+    if len(pcm) // _VAD_FRAME_BYTES <= max_frames:
+        return [audio_bytes]
+
+    segments = _speech_segments(pcm, max_frames)
+    if not segments:
+        return [audio_bytes]
+
+    encode_cmd = [
+        'ffmpeg',
+        '-f', 's16le', '-ac', '1', '-ar', str(_VAD_SAMPLE_RATE), '-i', 'pipe:0',
+        '-c:a', 'libopus',
+        '-b:a', str(_OPUS_BITRATE),
+        '-f', 'ogg',
+        '-fflags', '+bitexact',
+        '-flags:a', '+bitexact',
+        'pipe:1'
+    ]
+
+    def encode(segment: Tuple[int, int]) -> bytes:
+        start, end = segment
+        return _run_ffmpeg_pipe(
+            encode_cmd, pcm[start * _VAD_FRAME_BYTES:end * _VAD_FRAME_BYTES], "encode"
+        )
+
+    # ffmpeg runs outside the GIL, so segments encode in parallel
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        chunks = list(executor.map(encode, segments))
+
+    logger.info(f"Split audio into {len(chunks)} speech chunks of up to {chunk_seconds}s")
+    return chunks
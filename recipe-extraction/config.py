@@ -3,8 +3,10 @@ Configuration for recipe extraction service.
 """
 import os
 import sys
+from functools import lru_cache
 from typing import Optional
 from dotenv import load_dotenv
+from supabase import create_client, ClientOptions
 
 # Load environment variables from .env.local in project root
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -14,35 +16,42 @@ if os.path.exists(env_file):
 else:
     load_dotenv()  # Try default .env
 
-# Supabase client singleton
-_supabase_client = None
+# Resolve configuration once; the environment does not change after load_dotenv
+_SUPABASE_URL = os.environ.get("NEXT_PUBLIC_SUPABASE_URL") or os.environ.get("SUPABASE_URL")
+_SUPABASE_SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
+_REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379")
+_THUMBNAIL_BUCKET = os.environ.get("SUPABASE_THUMBNAIL_BUCKET", "recipe-thumbnails")
+_AUDIO_BUCKET = os.environ.get("SUPABASE_AUDIO_BUCKET", "recipe-audio")
+_DATABASE_URL = os.environ.get("SUPABASE_DB_URL")
 
+# PostgREST and storage each keep their own connection; only the timeouts are set here
+_SUPABASE_TIMEOUT_SECONDS = 60
 
-def get_supabase_client():
-    """Get Supabase client with service role key."""
-    global _supabase_client
-
-    if _supabase_client is None:
-        from supabase import create_client
-
-        url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL") or os.environ.get("SUPABASE_URL")
-        key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-
-        if not url or not key:
-            raise ValueError(
-                "SUPABASE_URL (or NEXT_PUBLIC_SUPABASE_URL) and SUPABASE_SERVICE_ROLE_KEY must be set"
-            )
 
-        _supabase_client = create_client(url, key)
-
-    return _supabase_client
+@lru_cache(maxsize=1)
+def get_supabase_client():
+    """Get Supabase client with service role key (created once, reused across jobs)."""
+    if not _SUPABASE_URL or not _SUPABASE_SERVICE_ROLE_KEY:
+        raise ValueError(
+            "SUPABASE_URL (or NEXT_PUBLIC_SUPABASE_URL) and SUPABASE_SERVICE_ROLE_KEY must be set"
+        )
+
+    return create_client(
+        _SUPABASE_URL,
+        _SUPABASE_SERVICE_ROLE_KEY,
+        options=ClientOptions(
+            postgrest_client_timeout=_SUPABASE_TIMEOUT_SECONDS,
+            storage_client_timeout=_SUPABASE_TIMEOUT_SECONDS
+        )
+    )
 
 
 def get_redis_url() -> str:
     """Get Redis URL from environment."""
-    return os.environ.get("REDIS_URL", "redis://localhost:6379")
+    return _REDIS_URL
 
 
+@lru_cache(maxsize=None)
 def get_openai_api_key() -> str:
     """Get OpenAI API key from environment."""
     key = os.environ.get("OPENAI_API_KEY")
@@ -53,17 +62,21 @@ def get_openai_api_key() -> str:
 
 def get_supabase_url() -> str:
     """Get Supabase URL from environment."""
-    url = os.environ.get("NEXT_PUBLIC_SUPABASE_URL") or os.environ.get("SUPABASE_URL")
-    if not url:
+    if not _SUPABASE_URL:
         raise ValueError("SUPABASE_URL or NEXT_PUBLIC_SUPABASE_URL must be set")
-    return url
+    return _SUPABASE_URL
 
 
 def get_thumbnail_bucket() -> str:
     """Get thumbnail bucket name."""
-    return os.environ.get("SUPABASE_THUMBNAIL_BUCKET", "recipe-thumbnails")
+    return _THUMBNAIL_BUCKET
 
 
 def get_audio_bucket() -> str:
     """Get audio bucket name."""
-    return os.environ.get("SUPABASE_AUDIO_BUCKET", "recipe-audio")
+    return _AUDIO_BUCKET
+
+
+def get_database_url() -> Optional[str]:
+    """Get the direct Postgres connection string, if configured (enables bulk COPY writes)."""
+    return _DATABASE_URL
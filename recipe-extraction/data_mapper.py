@@ -2,12 +2,26 @@
 Maps AI-extracted recipe data to RecipeSave database schema.
 """
 import logging
-from typing import Dict, List
+from typing import Dict, List, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Column order of the child-table records used for bulk COPY
+INGREDIENT_COLUMNS = ("recipe_id", "raw_text", "item", "quantity", "unit", "order_index")
+INSTRUCTION_COLUMNS = ("recipe_id", "step_number", "text")
 
-def map_recipe_to_database(recipe_data: Dict, recipe_id: str, user_id: str) -> Dict:
+
+def _recipe_id_str(recipe_id) -> str:
+    """Return recipe_id as a string, skipping the conversion when it already is one (e.g. not a UUID)."""
+    return recipe_id if isinstance(recipe_id, str) else str(recipe_id)
+
+
+def map_recipe_to_database(
+    recipe_data: Dict,
+    recipe_id: str,
+    user_id: str,
+    columnar: bool = False
+) -> Dict:
     """
     Map AI-extracted recipe data to database insert format.
 
@@ -15,6 +29,7 @@ def map_recipe_to_database(recipe_data: Dict, recipe_id: str, user_id: str) -> D
         recipe_data: Output from recipe_analyzer.extract_recipe_from_transcript()
         recipe_id: UUID string of the recipe record
         user_id: UUID string of the user who created the recipe
+        columnar: Return child rows as parallel column lists instead of row dicts
 
     Returns:
         {
@@ -22,6 +37,10 @@ def map_recipe_to_database(recipe_data: Dict, recipe_id: str, user_id: str) -> D
             "ingredients": [...],
             "instructions": [...]
         }
+
+        With columnar=True, "ingredients" and "instructions" are replaced by
+        "ingredients_columns" and "instructions_columns": dicts mapping each
+        column name to a list of values, ready for bulk insert helpers.
     """
 
     # Map recipe fields
@@ -35,26 +54,36 @@ def map_recipe_to_database(recipe_data: Dict, recipe_id: str, user_id: str) -> D
         "status": "completed"
     }
 
+    if columnar:
+        return {
+            "recipe_update": recipe_update,
+            **_map_child_columns(recipe_data, recipe_id)
+        }
+
+    rid = _recipe_id_str(recipe_id)
+
     # Map ingredients
-    ingredients = []
-    for idx, ing in enumerate(recipe_data.get("ingredients", [])):
-        ingredients.append({
-            "recipe_id": str(recipe_id),
+    ingredients = [
+        {
+            "recipe_id": rid,
             "raw_text": ing.get("raw_text", ""),
             "item": ing.get("item"),
             "quantity": ing.get("quantity"),
             "unit": ing.get("unit"),
             "order_index": idx
-        })
+        }
+        for idx, ing in enumerate(recipe_data.get("ingredients") or [])
+    ]
 
     # Map instructions
-    instructions = []
-    for inst in recipe_data.get("instructions", []):
-        instructions.append({
-            "recipe_id": str(recipe_id),
+    instructions = [
+        {
+            "recipe_id": rid,
             "step_number": inst.get("step", 0),
             "text": inst.get("text", "")
-        })
+        }
+        for inst in recipe_data.get("instructions") or []
+    ]
 
     logger.info(
         f"Mapped recipe data: {len(ingredients)} ingredients, "
@@ -66,3 +95,82 @@ def map_recipe_to_database(recipe_data: Dict, recipe_id: str, user_id: str) -> D
         "ingredients": ingredients,
         "instructions": instructions
     }
+
+
+def _map_child_columns(recipe_data: Dict, recipe_id: str) -> Dict:
+    """
+    Build ingredient and instruction rows as parallel column lists (one list per column).
+
+    Avoids repeating the same keys in every row dict and can be handed directly
+    to bulk insert helpers in a single round-trip.
+    """
+    rid = _recipe_id_str(recipe_id)
+
+    raw_texts: List = []
+    items: List = []
+    quantities: List = []
+    units: List = []
+    ingredients = recipe_data.get("ingredients") or []
+    for ing in ingredients:
+        raw_texts.append(ing.get("raw_text", ""))
+        items.append(ing.get("item"))
+        quantities.append(ing.get("quantity"))
+        units.append(ing.get("unit"))
+
+    step_numbers: List = []
+    texts: List = []
+    instructions = recipe_data.get("instructions") or []
+    for inst in instructions:
+        step_numbers.append(inst.get("step", 0))
+        texts.append(inst.get("text", ""))
+
+    logger.info(
+        f"Mapped recipe data (columnar): {len(items)} ingredients, "
+        f"{len(texts)} instructions"
+    )
+
+    return {
+        "ingredients_columns": {
+            "recipe_id": [rid] * len(items),
+            "raw_text": raw_texts,
+            "item": items,
+            "quantity": quantities,
+            "unit": units,
+            "order_index": list(range(len(items)))
+        },
+        "instructions_columns": {
+            "recipe_id": [rid] * len(texts),
+            "step_number": step_numbers,
+            "text": texts
+        }
+    }
+
+
+def columns_to_records(columns: Dict[str, List], order: Sequence[str]) -> List[Tuple]:
+    """
+    Turn a column dict from map_recipe_to_database(columnar=True) into row tuples.
+
+    Args:
+        columns: "ingredients_columns" or "instructions_columns"
+        order: Column order, e.g. INGREDIENT_COLUMNS
+
+    Returns:
+        One tuple per row, ready for asyncpg's copy_records_to_table
+    """
+    return list(zip(*(columns[column] for column in order)))
+
+
+def columns_to_rows(columns: Dict[str, List]) -> List[Dict]:
+    """
+    Turn a column dict from map_recipe_to_database(columnar=True) into row dicts.
+
+    Only for APIs that need one JSON object per row (PostgREST/RPC payloads).
+
+    Args:
+        columns: "ingredients_columns" or "instructions_columns"
+
+    Returns:
+        One dict per row
+    """
+    names = tuple(columns)
+    return [dict(zip(names, values)) for values in zip(*columns.values())]
@@ -0,0 +1,69 @@
+"""
+Encoding of JSON payloads stored in Redis (queue jobs and cache entries).
+Large payloads are zstd-compressed; readers detect compression by its magic
+bytes, so plain JSON (e.g. jobs from the TypeScript producer) still decodes.
+"""
+from typing import Any
+
+# orjson is several times faster than stdlib json; fall back to it if missing
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    import json as orjson
+
+# zstandard shrinks transcripts and recipes 3-5x; without it payloads stay plain JSON
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Every zstd frame starts with these bytes; JSON never does
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Below this size compression saves too little to be worth the CPU
+_COMPRESS_MIN_BYTES = 1024
+
+_compressor = zstandard.ZstdCompressor(level=3) if zstandard else None
+_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def encode_payload(value: Any) -> bytes:
+    """
+    Serialize value to JSON, zstd-compressing it when large enough.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        JSON bytes, or a zstd frame wrapping them
+    """
+    data = orjson.dumps(value)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if _compressor is not None and len(data) >= _COMPRESS_MIN_BYTES:
+        return _compressor.compress(data)
+    return data
+
+
+def decode_payload(data: bytes) -> Any:
+    """
+    Decode a payload written by encode_payload or a plain JSON producer.
+
+    Args:
+        data: Raw bytes read from Redis
+
+    Returns:
+        Decoded JSON value
+
+    Raises:
+        ValueError: If the payload is not valid JSON or cannot be decompressed
+    """
+    if data[:4] == ZSTD_MAGIC:
+        if _decompressor is None:
+            raise ValueError("Payload is zstd-compressed but zstandard is not installed")
+        try:
+            # max_output_size covers frames written without a content size
+            data = _decompressor.decompress(data, max_output_size=64 * 1024 * 1024)
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Failed to decompress payload: {e}") from e
+    return orjson.loads(data)
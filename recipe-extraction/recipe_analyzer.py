@@ -5,107 +5,146 @@ Extracts structured recipe data from transcripts.
 import json
 import logging
 import re
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from openai import OpenAI
 
+# orjson parses the GPT response several times faster; fall back to stdlib json if missing.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared.
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    import json as orjson
+
 logger = logging.getLogger(__name__)
 
 
+class NotARecipeError(ValueError):
+    """Raised when the transcript does not describe a recipe."""
+
+
+# OpenAI client singleton, shared across calls so they reuse one keep-alive pool
+_openai_client: Optional[OpenAI] = None
+
+
+def _get_client() -> OpenAI:
+    """Get or create the OpenAI client."""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAI()
+    return _openai_client
+
+
+# Script ranges checked by detect_transcript_language, in priority order:
+# (language name, first codepoint, last codepoint)
+_SCRIPT_RANGES = (
+    ("Hebrew", 0x0590, 0x05FF),
+    ("Arabic", 0x0600, 0x06FF),
+    ("Chinese", 0x4E00, 0x9FFF),
+    ("Japanese", 0x3040, 0x30FF),  # Hiragana + Katakana
+    ("Korean", 0xAC00, 0xD7AF),
+    ("Russian", 0x0400, 0x04FF),  # Cyrillic (Russian, Ukrainian, etc.)
+    ("Thai", 0x0E00, 0x0E7F),
+)
+
+# Transcript + description shorter than this cannot hold a recipe (e.g., music-only videos)
+_MIN_RECIPE_TEXT_CHARS = 50
+
+# Transcripts longer than this are extracted in ~_CHUNK_TARGET_CHARS chunks, concurrently
+_CHUNK_THRESHOLD_CHARS = 8000
+_CHUNK_TARGET_CHARS = 4000
+_MAX_CHUNK_WORKERS = 4
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?\u3002\uff01\uff1f])\s+')
+_WHITESPACE = re.compile(r'\s+')
+
+# Language is evident from a short prefix; no need to scan long transcripts in full
+_LANGUAGE_SAMPLE_CHARS = 2000
+
+
 def detect_transcript_language(text: str) -> str:
     """
     Simple language detection based on character sets.
     Returns language name for use in prompts.
+
+    Scans the first _LANGUAGE_SAMPLE_CHARS characters once, classifying each by
+    codepoint range. When several scripts appear, the earlier one in
+    _SCRIPT_RANGES wins.
     """
-    # Hebrew
-    if re.search(r'[\u0590-\u05FF]', text):
-        return "Hebrew"
-    # Arabic
-    if re.search(r'[\u0600-\u06FF]', text):
-        return "Arabic"
-    # Chinese
-    if re.search(r'[\u4E00-\u9FFF]', text):
-        return "Chinese"
-    # Japanese
-    if re.search(r'[\u3040-\u309F\u30A0-\u30FF]', text):
-        return "Japanese"
-    # Korean
-    if re.search(r'[\uAC00-\uD7AF]', text):
-        return "Korean"
-    # Cyrillic (Russian, Ukrainian, etc.)
-    if re.search(r'[\u0400-\u04FF]', text):
-        return "Russian"
-    # Thai
-    if re.search(r'[\u0E00-\u0E7F]', text):
-        return "Thai"
+    best = len(_SCRIPT_RANGES)
+    for ch in text[:_LANGUAGE_SAMPLE_CHARS]:
+        cp = ord(ch)
+        # Latin script, digits and punctuation never match a tracked range
+        if cp < 0x0400:
+            continue
+        for priority in range(best):
+            _, low, high = _SCRIPT_RANGES[priority]
+            if low <= cp <= high:
+                best = priority
+                break
+        if best == 0:
+            break
+
+    if best < len(_SCRIPT_RANGES):
+        return _SCRIPT_RANGES[best][0]
 
     # Default to original language (English assumed for Latin script)
     return "the original language"
 
 
-def extract_recipe_from_transcript(transcript: str, metadata: Optional[Dict] = None) -> Dict:
+def _clean_transcript(transcript: str) -> str:
     """
-    Extract recipe information from transcript using GPT-4o-mini.
-
-    Args:
-        transcript: Full transcript text from video
-        metadata: Optional video metadata (title, description)
+    Collapse whitespace and drop runaway repeats before sending text to GPT.
 
-    Returns:
-        {
-            "title": str,
-            "description": str,
-            "ingredients": [
-                {"item": str, "quantity": float, "unit": str, "raw_text": str}
-            ],
-            "instructions": [
-                {"step": int, "text": str}
-            ],
-            "prep_time_minutes": int,
-            "cook_time_minutes": int,
-            "servings": int,
-            "cuisine": str,
-            "dietary_tags": [str]
-        }
+    Whisper tends to hallucinate the same phrase over and over on silence; a sentence
+    is dropped once it has already appeared twice in a row.
     """
-    try:
-        logger.info(f"Extracting recipe from transcript (length: {len(transcript)} chars)")
+    text = _WHITESPACE.sub(' ', transcript).strip()
+    kept: List[str] = []
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        if len(kept) >= 2 and sentence == kept[-1] == kept[-2]:
+            continue
+        kept.append(sentence)
+    return ' '.join(kept)
 
-        client = OpenAI()
 
-        # Detect language from transcript
-        detected_language = detect_transcript_language(transcript)
-        logger.info(f"Detected transcript language: {detected_language}")
-
-        # Build context from metadata if available
-        context = ""
-        if metadata:
-            if metadata.get('title'):
-                context += f"Video Title: {metadata['title']}\n"
-            if metadata.get('description'):
-                context += f"Description: {metadata['description']}\n"
+def _request_recipe_json(
+    client: OpenAI,
+    transcript: str,
+    context: str,
+    language_instruction: str,
+    part: Optional[Tuple[int, int]] = None
+) -> Dict:
+    """
+    Send one transcript (or one chunk of it) to GPT-4o-mini and parse the JSON reply.
 
-        # Language preservation instruction
-        language_instruction = f"""
-CRITICAL - LANGUAGE PRESERVATION:
-- The transcript is in {detected_language}
-- Extract ALL text in {detected_language}: title, description, ingredients, instructions
-- Fix any spelling or grammar errors while preserving {detected_language}
-- Do NOT translate to English or any other language
-- Keep ingredient names, measurements, and all text in {detected_language}
-"""
+    Args:
+        part: (index, total) when transcript is one chunk of a longer transcript
+    """
+    part_label = ""
+    part_instruction = ""
+    if part:
+        part_label = f" (part {part[0]} of {part[1]})"
+        part_instruction = (
+            "This is only one part of a longer transcript. Extract whatever recipe content "
+            "this part contains, even if ingredients or steps are incomplete.\n\n"
+        )
 
-        # Recipe extraction prompt
-        prompt = f"""Extract recipe information from this cooking video transcript.
+    # Recipe extraction prompt
+    prompt = f"""Extract recipe information from this cooking video transcript.
 
 {context}
-Transcript:
+Transcript{part_label}:
 {transcript}
 
 {language_instruction}
 
-Please analyze the transcript and extract recipe information in JSON format with this exact structure:
+{part_instruction}First decide whether this transcript actually describes a recipe.
+If it does NOT (e.g., just talking about food), respond with exactly {{"is_recipe": false}} and nothing else.
+
+Otherwise, extract recipe information in JSON format with this exact structure:
 
 {{
+    "is_recipe": true,
     "title": "Recipe name (create a descriptive title if not explicitly stated)",
     "description": "Brief 1-2 sentence description of the dish",
     "ingredients": [
@@ -138,43 +177,195 @@ Guidelines:
 - Estimate prep/cook time if not explicitly stated
 - Cuisine should be one of: Italian, Mexican, Chinese, Japanese, Thai, Indian, French, American, Mediterranean, or "Other"
 - Dietary tags: vegetarian, vegan, gluten-free, dairy-free, keto, paleo, etc.
-- If this is NOT a recipe (e.g., just talking about food), set title to "Not a recipe" and leave other fields minimal
 
 Respond with ONLY valid JSON, no additional text."""
 
-        # Call OpenAI API
-        logger.info("Sending transcript to GPT-4o-mini for recipe analysis...")
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a multilingual culinary AI assistant specialized in extracting structured recipe data from video transcripts in any language. Preserve the original language, fix spelling errors, and always respond with valid JSON only."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,  # Lower temperature for consistent extraction
-            max_tokens=2000
+    # Call OpenAI API
+    logger.info("Sending transcript to GPT-4o-mini for recipe analysis...")
+    response = client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a multilingual culinary AI assistant specialized in extracting structured recipe data from video transcripts in any language. Preserve the original language, fix spelling errors, and always respond with valid JSON only."
+            },
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.3,  # Lower temperature for consistent extraction
+        max_tokens=2000,
+        response_format={"type": "json_object"}  # Guarantees a bare JSON object, no markdown fences
+    )
+
+    # Extract response
+    response_text = response.choices[0].message.content.strip()
+
+    # Parse JSON response
+    try:
+        recipe_data = orjson.loads(response_text)
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse AI response as JSON: {response_text[:200]}")
+        raise RuntimeError(f"Failed to parse recipe extraction response: {str(e)}")
+
+    return recipe_data
+
+
+def _split_transcript(transcript: str) -> List[str]:
+    """
+    Split a long transcript into chunks of roughly _CHUNK_TARGET_CHARS on sentence boundaries.
+
+    A single sentence longer than the target is cut into fixed-size pieces.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    for sentence in _SENTENCE_BOUNDARY.split(transcript):
+        while len(sentence) > _CHUNK_TARGET_CHARS:
+            chunks.append(sentence[:_CHUNK_TARGET_CHARS])
+            sentence = sentence[_CHUNK_TARGET_CHARS:]
+        if current and current_len + len(sentence) > _CHUNK_TARGET_CHARS:
+            chunks.append(" ".join(current))
+            current, current_len = [], 0
+        current.append(sentence)
+        current_len += len(sentence) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _merge_partial_recipes(partials: List[Dict]) -> Dict:
+    """
+    Merge per-chunk extraction results into one recipe.
+
+    Scalar fields come from the first chunk that has them. Ingredients are
+    de-duplicated by normalized item name, and instructions are concatenated
+    in chunk order and renumbered.
+    """
+    recipe_parts = [part for part in partials if part.get('is_recipe', True) is not False]
+    if not recipe_parts:
+        return {'is_recipe': False}
+
+    merged = dict(recipe_parts[0])
+    for field in ('title', 'description', 'prep_time_minutes', 'cook_time_minutes', 'servings', 'cuisine'):
+        if not merged.get(field):
+            value = next((part[field] for part in recipe_parts if part.get(field)), None)
+            if value is not None:
+                merged[field] = value
+
+    ingredients = []
+    seen_items = set()
+    for part in recipe_parts:
+        for ing in part.get('ingredients') or []:
+            key = (ing.get('item') or ing.get('raw_text') or '').strip().lower()
+            if key in seen_items:
+                continue
+            seen_items.add(key)
+            ingredients.append(ing)
+
+    instructions = [
+        {'step': step, 'text': inst.get('text', '')}
+        for step, inst in enumerate(
+            (inst for part in recipe_parts for inst in part.get('instructions') or []),
+            start=1
         )
+    ]
+
+    dietary_tags = []
+    for part in recipe_parts:
+        for tag in part.get('dietary_tags') or []:
+            if tag not in dietary_tags:
+                dietary_tags.append(tag)
+
+    merged['ingredients'] = ingredients
+    merged['instructions'] = instructions
+    merged['dietary_tags'] = dietary_tags
+    return merged
+
+
+def extract_recipe_from_transcript(transcript: str, metadata: Optional[Dict] = None) -> Dict:
+    """
+    Extract recipe information from transcript using GPT-4o-mini.
+
+    Args:
+        transcript: Full transcript text from video
+        metadata: Optional video metadata (title, description)
+
+    Returns:
+        {
+            "title": str,
+            "description": str,
+            "ingredients": [
+                {"item": str, "quantity": float, "unit": str, "raw_text": str}
+            ],
+            "instructions": [
+                {"step": int, "text": str}
+            ],
+            "prep_time_minutes": int,
+            "cook_time_minutes": int,
+            "servings": int,
+            "cuisine": str,
+            "dietary_tags": [str]
+        }
+
+    Raises:
+        NotARecipeError: If the text is too short or the model judges it is not a recipe
+        RuntimeError: If extraction fails
+    """
+    try:
+        logger.info(f"Extracting recipe from transcript (length: {len(transcript)} chars)")
+
+        # Fewer tokens sent means lower latency and cost
+        transcript = _clean_transcript(transcript)
+
+        # Too little text to hold a recipe; skip the GPT round-trip entirely
+        description = (metadata or {}).get('description') or ''
+        if len(transcript.strip()) + len(description.strip()) < _MIN_RECIPE_TEXT_CHARS:
+            logger.warning("Transcript too short to contain a recipe, skipping GPT call")
+            raise NotARecipeError("Video does not contain recipe content")
 
-        # Extract response
-        response_text = response.choices[0].message.content.strip()
-
-        # Parse JSON response
-        try:
-            # Remove markdown code blocks if present
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            if response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-
-            recipe_data = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse AI response as JSON: {response_text[:200]}")
-            raise RuntimeError(f"Failed to parse recipe extraction response: {str(e)}")
+        client = _get_client()
+
+        # Detect language from transcript
+        detected_language = detect_transcript_language(transcript)
+        logger.info(f"Detected transcript language: {detected_language}")
+
+        # Build context from metadata if available
+        context = ""
+        if metadata:
+            if metadata.get('title'):
+                context += f"Video Title: {metadata['title']}\n"
+            if metadata.get('description'):
+                context += f"Description: {metadata['description']}\n"
+
+        # Language preservation instruction
+        language_instruction = f"""
+CRITICAL - LANGUAGE PRESERVATION:
+- The transcript is in {detected_language}
+- Extract ALL text in {detected_language}: title, description, ingredients, instructions
+- Fix any spelling or grammar errors while preserving {detected_language}
+- Do NOT translate to English or any other language
+- Keep ingredient names, measurements, and all text in {detected_language}
+"""
+
+        if len(transcript) > _CHUNK_THRESHOLD_CHARS:
+            # Long transcript: extract from chunks concurrently, then merge
+            chunks = _split_transcript(transcript)
+            logger.info(f"Transcript is long; extracting from {len(chunks)} chunks concurrently")
+            with ThreadPoolExecutor(max_workers=min(len(chunks), _MAX_CHUNK_WORKERS)) as executor:
+                partials = list(executor.map(
+                    lambda numbered: _request_recipe_json(
+                        client, numbered[1], context, language_instruction,
+                        part=(numbered[0], len(chunks))
+                    ),
+                    enumerate(chunks, start=1)
+                ))
+            recipe_data = _merge_partial_recipes(partials)
+        else:
+            recipe_data = _request_recipe_json(client, transcript, context, language_instruction)
+
+        # The model classifies and extracts in one call; bail out before validating fields
+        if recipe_data.pop('is_recipe', True) is False:
+            logger.warning("Content is not a recipe")
+            raise NotARecipeError("Video does not contain recipe content")
 
         # Validate required fields
         required_fields = ['title', 'ingredients', 'instructions']
@@ -183,10 +374,9 @@ Respond with ONLY valid JSON, no additional text."""
                 logger.error(f"Missing required field '{field}' in AI response")
                 raise ValueError(f"AI response missing required field: {field}")
 
-        # Validate it's actually a recipe
-        if recipe_data.get('title', '').lower() == 'not a recipe':
-            logger.warning("Content is not a recipe")
-            raise ValueError("Video does not contain recipe content")
+        # The model occasionally emits null lists; normalize so callers can iterate safely
+        recipe_data['ingredients'] = recipe_data.get('ingredients') or []
+        recipe_data['instructions'] = recipe_data.get('instructions') or []
 
         # Set defaults for optional fields
         recipe_data.setdefault('description', '')
@@ -205,6 +395,8 @@ Respond with ONLY valid JSON, no additional text."""
 
         return recipe_data
 
+    except NotARecipeError:
+        raise
     except Exception as e:
         logger.error(f"Recipe extraction failed: {e}", exc_info=True)
         raise RuntimeError(f"Failed to extract recipe: {str(e)}")
@@ -2,13 +2,20 @@
 Main orchestrator for recipe extraction pipeline.
 Reuses IG Downloader utilities while adding recipe-specific logic.
 """
-import io
+import asyncio
+import hashlib
+import json
 import logging
 import os
+import re
 import sys
 import tempfile
+import time
 import shutil
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Set
 
 # Add extraction/ to Python path to import IG Downloader utilities
 extraction_path = os.path.join(os.path.dirname(__file__), '..', 'extraction')
@@ -16,29 +23,344 @@ sys.path.insert(0, extraction_path)
 
 # Import IG Downloader utilities (pristine, never modified)
 from utils.platform_router import PlatformRouter
-from utils.audio_processor import convert_video_file_to_audio
-from utils.platform_detector import detect_platform
+from utils.platform_detector import Platform, detect_platform
 from utils.supabase_client import upload_file_to_bucket
 
 # Import RecipeSave-specific modules
+from audio_utils import extract_audio_and_thumbnail, split_audio_on_speech
+from payloads import decode_payload, encode_payload
 from recipe_analyzer import extract_recipe_from_transcript
-from data_mapper import map_recipe_to_database
-from config import get_supabase_client, get_supabase_url, get_thumbnail_bucket
+from data_mapper import (
+    INGREDIENT_COLUMNS,
+    INSTRUCTION_COLUMNS,
+    columns_to_records,
+    columns_to_rows,
+    map_recipe_to_database,
+)
+from config import (
+    get_database_url,
+    get_redis_url,
+    get_supabase_client,
+    get_supabase_url,
+    get_thumbnail_bucket,
+)
+
+import redis.asyncio as aioredis
+
+# asyncpg enables the direct-Postgres COPY path for child rows (optional)
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - optional dependency
+    asyncpg = None
 
 # Import OpenAI for direct transcription
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
+# Whisper client shared by every job, so chunk uploads reuse keep-alive connections
+_OPENAI_CLIENT = AsyncOpenAI(
+    http_client=httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+        timeout=httpx.Timeout(600.0, connect=10.0)
+    )
+)
+
+# Client for fetching platform thumbnails on the caption fast path, reused across jobs
+_THUMBNAIL_HTTP_CLIENT = httpx.AsyncClient(timeout=15.0, follow_redirects=True)
+
+# Quantity + unit pairs ("200 g", "1½ cups", "2 tbsp") that mark a written recipe.
+# Captions with at least _RECIPE_TEXT_MIN_MEASUREMENTS of them skip download and Whisper.
+_MEASUREMENT_RE = re.compile(
+    r"\d+(?:[.,/]\d+)?\s*[½¼¾⅓⅔]?\s*"
+    r"(?:g|gr|grams?|kg|ml|l|liters?|litres?|cups?|tbsps?|tablespoons?|tsps?|teaspoons?|oz|ounces?|lbs?|pounds?)\b",
+    re.IGNORECASE
+)
+_RECIPE_TEXT_MIN_MEASUREMENTS = 3
+
+
+def _looks_like_recipe_text(text: str) -> bool:
+    """Return True if text reads like a written ingredient list (several quantities with units)."""
+    if not text:
+        return False
+    matches = 0
+    for _ in _MEASUREMENT_RE.finditer(text):
+        matches += 1
+        if matches >= _RECIPE_TEXT_MIN_MEASUREMENTS:
+            return True
+    return False
+
+
+# Platform handlers are stateless between jobs; build them once per worker
+_ROUTER = PlatformRouter()
+
+
+@lru_cache(maxsize=256)
+def _detect_platform(url: str) -> Platform:
+    """detect_platform, memoized per URL (resubmitted URLs skip the pattern scan)."""
+    return detect_platform(url)
+
+
+# Transcripts and extracted recipes are cached by content hash, so a video that is
+# submitted again (same audio, possibly under a different URL) skips Whisper and GPT
+_CACHE_TTL_SECONDS = 30 * 86400
+_cache_client = None
+
+
+def _get_cache():
+    """Get or create the Redis client used for the content-hash cache."""
+    global _cache_client
+    if _cache_client is None:
+        _cache_client = aioredis.from_url(get_redis_url())
+    return _cache_client
+
+
+def _content_key(prefix: str, *parts) -> str:
+    """Build a cache key from the SHA-256 of the given str/bytes parts."""
+    digest = hashlib.sha256(usedforsecurity=False)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else part.encode('utf-8'))
+        digest.update(b'\0')
+    return f"{prefix}:{digest.hexdigest()}"
+
+
+async def _cache_get(key: str) -> Optional[Dict]:
+    """Return the cached value for key, or None on a miss, Redis error or undecodable entry."""
+    try:
+        cached = await _get_cache().get(key)
+        return decode_payload(cached) if cached else None
+    except Exception as e:
+        logger.warning(f"Cache read failed (non-critical): {e}")
+        return None
+
+
+async def _cache_set(key: str, value: Dict) -> None:
+    """Store value under key; Redis errors are logged, not raised."""
+    try:
+        await _get_cache().set(key, encode_payload(value), ex=_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Cache write failed (non-critical): {e}")
+
+
+# Maximum number of audio chunks in flight to Whisper for a single recipe
+WHISPER_MAX_CONCURRENCY = 4
+
+# Cap on Whisper requests in flight across all recipes processed by this worker
+_WHISPER_GLOBAL_LIMIT = int(os.environ.get("WHISPER_GLOBAL_CONCURRENCY", "8"))
+_whisper_slots: Optional[asyncio.Semaphore] = None
 
-def transcribe_audio_bytes(audio_bytes: bytes) -> Dict:
+
+# verbose_json reports the language by name, but the request expects ISO-639-1 codes
+_WHISPER_LANGUAGE_CODES = {
+    "english": "en", "spanish": "es", "french": "fr", "german": "de",
+    "italian": "it", "portuguese": "pt", "dutch": "nl", "hebrew": "he",
+    "arabic": "ar", "russian": "ru", "ukrainian": "uk", "polish": "pl",
+    "turkish": "tr", "greek": "el", "hindi": "hi", "chinese": "zh",
+    "japanese": "ja", "korean": "ko", "thai": "th", "vietnamese": "vi",
+    "indonesian": "id", "malay": "ms", "tagalog": "tl", "swedish": "sv",
+    "norwegian": "no", "danish": "da", "finnish": "fi", "czech": "cs",
+    "romanian": "ro", "hungarian": "hu", "persian": "fa",
+}
+
+
+def _get_whisper_slots() -> asyncio.Semaphore:
+    """Get or create the worker-wide Whisper semaphore (bound to the running loop)."""
+    global _whisper_slots
+    if _whisper_slots is None:
+        _whisper_slots = asyncio.Semaphore(_WHISPER_GLOBAL_LIMIT)
+    return _whisper_slots
+
+
+# Blocking supabase-py calls get their own pool instead of asyncio's default one,
+# which also runs downloads and ffmpeg; database writes never queue behind them
+_SB_EXEC = ThreadPoolExecutor(max_workers=16, thread_name_prefix="supabase")
+
+
+async def sb(fn, *args):
     """
-    Transcribe audio bytes directly using OpenAI Whisper API.
+    Run a blocking Supabase call on the shared Supabase thread pool.
 
-    This is a local version that doesn't require uploading to storage first.
+    Args:
+        fn: Callable to run, e.g. a query builder's bound execute method
+        *args: Positional arguments for fn
+
+    Returns:
+        Whatever fn returns
+    """
+    return await asyncio.get_running_loop().run_in_executor(_SB_EXEC, partial(fn, *args))
+
+
+# Direct Postgres pool for bulk writes, created on first use when SUPABASE_DB_URL is set
+_pg_pool = None
+_pg_pool_lock = asyncio.Lock()
+
+
+async def _get_pg_pool():
+    """Get or create the asyncpg pool, or None when direct Postgres access is not configured."""
+    global _pg_pool
+    database_url = get_database_url()
+    if asyncpg is None or not database_url:
+        return None
+
+    async with _pg_pool_lock:
+        if _pg_pool is None:
+            # statement_cache_size=0 keeps the pool usable behind Supabase's transaction pooler
+            _pg_pool = await asyncpg.create_pool(
+                database_url, min_size=1, max_size=4, statement_cache_size=0
+            )
+    return _pg_pool
+
+
+async def _finalize_recipe(supabase, recipe_id: str, mapped_data: Dict) -> None:
+    """
+    Write the recipe update and its ingredients/instructions in one transaction.
+
+    With SUPABASE_DB_URL set, the recipe is updated through finalize_recipe with
+    empty child lists (which clears old rows) and the children are loaded with
+    binary COPY on the same connection. Otherwise the whole payload goes
+    through the finalize_recipe RPC over PostgREST.
+    """
+    pool = await _get_pg_pool()
+
+    if pool is None:
+        await sb(
+            supabase.rpc("finalize_recipe", {
+                "recipe_id": recipe_id,
+                "recipe": mapped_data["recipe_update"],
+                "ingredients": columns_to_rows(mapped_data["ingredients_columns"]),
+                "instructions": columns_to_rows(mapped_data["instructions_columns"])
+            }).execute
+        )
+        return
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute(
+                "SELECT finalize_recipe($1::uuid, $2::jsonb, '[]'::jsonb, '[]'::jsonb)",
+                recipe_id,
+                json.dumps(mapped_data["recipe_update"])
+            )
+            ingredient_records = columns_to_records(
+                mapped_data["ingredients_columns"], INGREDIENT_COLUMNS
+            )
+            if ingredient_records:
+                await conn.copy_records_to_table(
+                    "ingredients", records=ingredient_records, columns=INGREDIENT_COLUMNS
+                )
+            instruction_records = columns_to_records(
+                mapped_data["instructions_columns"], INSTRUCTION_COLUMNS
+            )
+            if instruction_records:
+                await conn.copy_records_to_table(
+                    "instructions", records=instruction_records, columns=INSTRUCTION_COLUMNS
+                )
+
+
+class _StatusBatcher:
+    """
+    Coalesce intermediate recipe status changes and write them in the background.
+
+    Pipeline steps call put() without waiting on Supabase. A background task
+    flushes every interval, writing the latest status of each recipe with one
+    UPDATE per distinct status. Terminal writes go through terminal(), which
+    waits out any in-flight flush, drops the recipe's pending status and marks
+    it terminal so a stale intermediate status can never overwrite
+    "completed" or "failed". The final write itself runs outside the lock.
+    """
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._pending: Dict[str, str] = {}
+        self._terminal: Set[str] = set()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def put(self, recipe_id: str, status: str) -> None:
+        """Queue a status change; the latest status per recipe wins."""
+        logger.info(f"Status update: {recipe_id} -> {status}")
+        if recipe_id in self._terminal:
+            return
+        self._pending[recipe_id] = status
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Status flush failed (non-critical): {e}")
+
+    async def flush(self) -> None:
+        """Write all pending status changes now."""
+        async with self._lock:
+            pending, self._pending = self._pending, {}
+
+            by_status: Dict[str, List[str]] = {}
+            for recipe_id, status in pending.items():
+                if recipe_id in self._terminal:
+                    continue
+                by_status.setdefault(status, []).append(recipe_id)
+
+            supabase = get_supabase_client()
+            for status, recipe_ids in by_status.items():
+                await sb(
+                    supabase.table("recipes").update({
+                        "status": status
+                    }).in_("id", recipe_ids).execute
+                )
+
+    @asynccontextmanager
+    async def terminal(self, recipe_id: str):
+        """Keep flushes from touching recipe_id while its final write runs."""
+        async with self._lock:
+            self._pending.pop(recipe_id, None)
+            self._terminal.add(recipe_id)
+        try:
+            yield
+        finally:
+            self._terminal.discard(recipe_id)
+
+
+# Intermediate status changes are flushed to Supabase at most this often (seconds)
+STATUS_FLUSH_INTERVAL = 0.5
+_status_batcher = _StatusBatcher(STATUS_FLUSH_INTERVAL)
+
+
+async def _transcribe_chunk(
+    chunk: bytes,
+    semaphore: asyncio.Semaphore,
+    language: Optional[str] = None
+):
+    """Send one audio chunk to Whisper, holding a semaphore slot while in flight."""
+    async with semaphore, _get_whisper_slots():
+        return await _OPENAI_CLIENT.audio.transcriptions.create(
+            model="whisper-1",
+            # (filename, content, content type): httpx streams the bytes as-is, no BytesIO wrapper
+            file=("audio.ogg", chunk, "audio/ogg"),
+            response_format="verbose_json",
+            language=language
+        )
+
+
+async def transcribe_audio_bytes_async(
+    audio_bytes: bytes,
+    max_concurrency: int = WHISPER_MAX_CONCURRENCY
+) -> Dict:
+    """
+    Transcribe audio bytes using OpenAI Whisper, sending chunks concurrently.
+
+    Long audio is split on pauses in speech into chunks of up to 30 seconds
+    (see split_audio_on_speech). The first chunk is transcribed alone to
+    detect the language, which is then passed to the remaining chunks so
+    Whisper skips detection on them. Chunk texts are joined in order.
 
     Args:
         audio_bytes: Audio file content as bytes
+        max_concurrency: Maximum number of chunks in flight at once
 
     Returns:
         Dictionary containing:
@@ -48,24 +370,25 @@ def transcribe_audio_bytes(audio_bytes: bytes) -> Dict:
     try:
         logger.info(f"Starting transcription for audio ({len(audio_bytes)} bytes)")
 
-        client = OpenAI()
+        chunks = await asyncio.to_thread(split_audio_on_speech, audio_bytes)
 
-        # Create a file-like object for OpenAI API
-        audio_file = io.BytesIO(audio_bytes)
-        audio_file.name = "audio.mp3"  # OpenAI needs a filename
+        semaphore = asyncio.Semaphore(max_concurrency)
 
         # Call OpenAI Whisper API
-        logger.info("Sending audio to OpenAI Whisper API...")
-        transcript = client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_file,
-            response_format="verbose_json",
-            language=None  # Auto-detect language
-        )
+        logger.info(f"Sending {len(chunks)} audio chunk(s) to OpenAI Whisper API...")
+        first = await _transcribe_chunk(chunks[0], semaphore)
+        language = getattr(first, 'language', None)
+        language_code = _WHISPER_LANGUAGE_CODES.get((language or '').lower())
+
+        rest = await asyncio.gather(*[
+            _transcribe_chunk(chunk, semaphore, language=language_code)
+            for chunk in chunks[1:]
+        ])
 
+        texts = [first.text] + [transcript.text for transcript in rest]
         result = {
-            'text': transcript.text,
-            'language': transcript.language if hasattr(transcript, 'language') else None,
+            'text': ' '.join(text.strip() for text in texts if text),
+            'language': language,
         }
 
         logger.info(f"Transcription complete. Language: {result['language']}, Length: {len(result['text'])} chars")
@@ -77,6 +400,24 @@ def transcribe_audio_bytes(audio_bytes: bytes) -> Dict:
         raise RuntimeError(f"Failed to transcribe audio: {str(e)}")
 
 
+# Crockford base32, as used by ULIDs (no I, L, O, U)
+_ULID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def _ulid() -> str:
+    """
+    Return a ULID: 48-bit millisecond timestamp + 80 random bits, as 26 base32 chars.
+
+    Sorts by creation time and never collides in practice, without formatting a datetime.
+    """
+    value = ((time.time_ns() // 1_000_000) << 80) | int.from_bytes(os.urandom(10), 'big')
+    chars = []
+    for _ in range(26):
+        value, index = divmod(value, 32)
+        chars.append(_ULID_ALPHABET[index])
+    return ''.join(reversed(chars))
+
+
 def upload_thumbnail_to_storage(thumbnail_bytes: bytes, recipe_id: str) -> str:
     """
     Upload thumbnail to Supabase storage.
@@ -88,11 +429,8 @@ def upload_thumbnail_to_storage(thumbnail_bytes: bytes, recipe_id: str) -> str:
     Returns:
         Public URL of the uploaded thumbnail
     """
-    from datetime import datetime
-
     bucket_name = get_thumbnail_bucket()
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    file_path = f"{recipe_id}_{timestamp}.jpg"
+    file_path = f"{recipe_id}_{_ulid()}.jpg"
 
     supabase_url = get_supabase_url()
 
@@ -114,10 +452,104 @@ def upload_thumbnail_to_storage(thumbnail_bytes: bytes, recipe_id: str) -> str:
     return public_url
 
 
-def process_recipe_extraction(recipe_id: str, url: str, user_id: str) -> Dict:
+async def _transcribe_cached(audio_bytes: bytes) -> Dict:
+    """transcribe_audio_bytes_async, memoized on the SHA-256 of the audio."""
+    key = _content_key("tx", audio_bytes)
+    cached = await _cache_get(key)
+    if cached is not None:
+        logger.info("Transcript cache hit, skipping Whisper")
+        return cached
+
+    transcript_data = await transcribe_audio_bytes_async(audio_bytes)
+    await _cache_set(key, transcript_data)
+    return transcript_data
+
+
+async def _extract_recipe_cached(transcript_text: str, title: str, description: str) -> Dict:
+    """extract_recipe_from_transcript, memoized on the SHA-256 of its inputs."""
+    key = _content_key("recipe", transcript_text, title, description)
+    cached = await _cache_get(key)
+    if cached is not None:
+        logger.info("Recipe cache hit, skipping GPT extraction")
+        return cached
+
+    recipe_data = await asyncio.to_thread(
+        extract_recipe_from_transcript,
+        transcript_text,
+        metadata={'title': title, 'description': description}
+    )
+    await _cache_set(key, recipe_data)
+    return recipe_data
+
+
+async def _fetch_remote_thumbnail(thumbnail_url: Optional[str]) -> Optional[bytes]:
+    """Download the platform's own thumbnail image; failures are logged, not raised."""
+    if not thumbnail_url:
+        return None
+    try:
+        response = await _THUMBNAIL_HTTP_CLIENT.get(thumbnail_url)
+        response.raise_for_status()
+        return response.content
+    except Exception as e:
+        logger.warning(f"Thumbnail download failed (non-critical): {e}")
+        return None
+
+
+async def _upload_thumbnail_safe(thumbnail_bytes: Optional[bytes], recipe_id: str) -> Optional[str]:
+    """Upload the thumbnail if there is one; failures are logged, not raised."""
+    if not thumbnail_bytes:
+        return None
+    try:
+        return await sb(upload_thumbnail_to_storage, thumbnail_bytes, recipe_id)
+    except Exception as e:
+        logger.warning(f"Thumbnail upload failed (non-critical): {e}")
+        return None
+
+
+def _download_and_extract_audio(handler, url: str, metadata: Dict, recipe_id: str, platform_name: str):
+    """
+    Download the video to a temp dir and extract audio + thumbnail from it.
+
+    Blocking; run it in a worker thread from the event loop.
+
+    Returns:
+        Tuple of (audio_bytes, thumbnail_bytes or None)
+    """
+    temp_dir = tempfile.mkdtemp(prefix=f"{platform_name}_")
+    try:
+        download_target = os.path.join(temp_dir, recipe_id)
+        downloaded_path = handler.download_video(url, download_target, metadata=metadata)
+
+        audio_bytes, thumbnail_bytes = extract_audio_and_thumbnail(downloaded_path)
+
+        logger.info(f"Audio extracted: {len(audio_bytes)} bytes")
+        return audio_bytes, thumbnail_bytes
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+async def mark_recipe_failed(recipe_id: str) -> None:
+    """Set the recipe's status to failed; errors are logged, not raised."""
+    try:
+        supabase = get_supabase_client()
+        async with _status_batcher.terminal(recipe_id):
+            await sb(
+                supabase.table("recipes").update({
+                    "status": "failed"
+                }).eq("id", recipe_id).execute
+            )
+    except Exception as update_error:
+        logger.error(f"Failed to update recipe status to failed: {update_error}")
+
+
+async def process_recipe_extraction(recipe_id: str, url: str, user_id: str) -> Dict:
     """
     Main recipe extraction pipeline.
 
+    Blocking steps run in worker threads so several recipes can be processed
+    on one event loop: platform handlers and ffmpeg on asyncio's default pool,
+    Supabase calls on the dedicated pool behind sb().
+
     Flow:
         1. Download video (via IG Downloader platform handlers)
         2. Extract audio + thumbnail (via IG Downloader audio processor)
@@ -137,106 +569,98 @@ def process_recipe_extraction(recipe_id: str, url: str, user_id: str) -> Dict:
             "title": str
         }
     """
-    supabase = None
-
     try:
         logger.info(f"Starting recipe extraction for {recipe_id} from {url}")
 
         supabase = get_supabase_client()
 
         # Update status: downloading
-        update_recipe_status(supabase, recipe_id, "downloading")
+        _status_batcher.put(recipe_id, "downloading")
 
         # Step 1: Detect platform and get handler (IG Downloader)
-        platform = detect_platform(url)
+        platform = _detect_platform(url)
         platform_name = platform.value if platform else "unknown"
         logger.info(f"Platform detected: {platform_name}")
 
-        platform_router = PlatformRouter()
-        handler = platform_router.get_handler(url)
+        # Look the handler up directly rather than via get_handler, which would detect again
+        handler = _ROUTER.handlers.get(platform)
+        if handler is None:
+            raise ValueError(
+                "Unsupported platform. Please provide a URL from Instagram Reels, "
+                "TikTok, YouTube Shorts, or Facebook Reels."
+            )
 
         # Step 2: Fetch metadata (IG Downloader)
-        metadata = handler.fetch_metadata(url)
+        metadata = await asyncio.to_thread(handler.fetch_metadata, url)
         video_url = metadata.get('video_url')
         title = metadata.get('title', 'Recipe Video')
         duration = metadata.get('duration', 0)
         uploader = metadata.get('uploader') or metadata.get('channel') or 'Unknown'
-        description = metadata.get('description') or metadata.get('caption') or ''
+        # Most handlers keep the caption inside the raw yt-dlp info dict
+        raw_info = metadata.get('metadata') or {}
+        description = (
+            metadata.get('description')
+            or raw_info.get('description')
+            or metadata.get('caption')
+            or ''
+        )
 
         logger.info(f"Metadata fetched. Title: {title}, Duration: {duration}s")
 
-        # Update platform in database
-        supabase.table("recipes").update({
-            "platform": platform_name
-        }).eq("id", recipe_id).execute()
-
-        # Step 3: Download and extract audio (IG Downloader)
-        update_recipe_status(supabase, recipe_id, "extracting_audio")
-
-        temp_dir = tempfile.mkdtemp(prefix=f"{platform_name}_")
-        try:
-            download_target = os.path.join(temp_dir, recipe_id)
-            downloaded_path = handler.download_video(url, download_target, metadata=metadata)
-
-            audio_bytes, audio_filename, thumbnail_bytes = convert_video_file_to_audio(
-                downloaded_path
+        if _looks_like_recipe_text(description):
+            # Fast path: the caption already holds the recipe, so skip download,
+            # ffmpeg and Whisper and analyze the caption itself
+            logger.info("Description contains a written recipe, skipping transcription")
+            thumbnail_bytes = await _fetch_remote_thumbnail(
+                metadata.get('thumbnail_url') or raw_info.get('thumbnail')
+            )
+            thumbnail_url = await _upload_thumbnail_safe(thumbnail_bytes, recipe_id)
+            transcript_text = description
+            # The caption is already the transcript; sending it again as context doubles the tokens
+            context_description = ''
+        else:
+            # Step 3: Download and extract audio (IG Downloader)
+            _status_batcher.put(recipe_id, "extracting_audio")
+
+            audio_bytes, thumbnail_bytes = await asyncio.to_thread(
+                _download_and_extract_audio, handler, url, metadata, recipe_id, platform_name
             )
 
-            logger.info(f"Audio extracted: {len(audio_bytes)} bytes")
-        finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
-
-        # Step 4: Upload thumbnail if available
-        thumbnail_url = None
-        if thumbnail_bytes:
-            try:
-                thumbnail_url = upload_thumbnail_to_storage(thumbnail_bytes, recipe_id)
-                supabase.table("recipes").update({
-                    "thumbnail_url": thumbnail_url
-                }).eq("id", recipe_id).execute()
-                logger.info(f"Thumbnail uploaded: {thumbnail_url}")
-            except Exception as e:
-                logger.warning(f"Thumbnail upload failed (non-critical): {e}")
+            # Steps 4 + 5: Upload thumbnail and transcribe audio (OpenAI Whisper) concurrently
+            _status_batcher.put(recipe_id, "transcribing")
 
-        # Step 5: Transcribe audio (OpenAI Whisper)
-        update_recipe_status(supabase, recipe_id, "transcribing")
+            thumbnail_url, transcript_data = await asyncio.gather(
+                _upload_thumbnail_safe(thumbnail_bytes, recipe_id),
+                _transcribe_cached(audio_bytes)
+            )
+            transcript_text = transcript_data.get('text', '')
+            language = transcript_data.get('language', 'en')
 
-        transcript_data = transcribe_audio_bytes(audio_bytes)
-        transcript_text = transcript_data.get('text', '')
-        language = transcript_data.get('language', 'en')
+            logger.info(f"Transcription complete. Language: {language}, Length: {len(transcript_text)} chars")
+            context_description = description
 
-        logger.info(f"Transcription complete. Language: {language}, Length: {len(transcript_text)} chars")
+        if thumbnail_url:
+            logger.info(f"Thumbnail uploaded: {thumbnail_url}")
 
         # Step 6: Extract recipe data (RecipeSave - Custom)
-        update_recipe_status(supabase, recipe_id, "analyzing")
+        _status_batcher.put(recipe_id, "analyzing")
 
-        recipe_data = extract_recipe_from_transcript(
-            transcript_text,
-            metadata={'title': title, 'description': description}
-        )
+        recipe_data = await _extract_recipe_cached(transcript_text, title, context_description)
 
         logger.info(f"Recipe extracted: {recipe_data['title']}")
 
         # Step 7: Map to database schema (RecipeSave - Custom)
-        mapped_data = map_recipe_to_database(recipe_data, recipe_id, user_id)
+        # Child rows stay columnar until the write path picks its wire format
+        mapped_data = map_recipe_to_database(recipe_data, recipe_id, user_id, columnar=True)
+        mapped_data["recipe_update"]["platform"] = platform_name
+        if thumbnail_url:
+            mapped_data["recipe_update"]["thumbnail_url"] = thumbnail_url
 
         # Step 8: Store in database
-        # Update recipe
-        supabase.table("recipes").update(
-            mapped_data["recipe_update"]
-        ).eq("id", recipe_id).execute()
-
-        # Insert ingredients
-        if mapped_data["ingredients"]:
-            supabase.table("ingredients").insert(
-                mapped_data["ingredients"]
-            ).execute()
-
-        # Insert instructions
-        if mapped_data["instructions"]:
-            supabase.table("instructions").insert(
-                mapped_data["instructions"]
-            ).execute()
+        # One transaction updates the recipe (platform, thumbnail and "completed"
+        # status included) and replaces its ingredients and instructions
+        async with _status_batcher.terminal(recipe_id):
+            await _finalize_recipe(supabase, recipe_id, mapped_data)
 
         logger.info(f"Recipe extraction completed successfully: {recipe_id}")
 
@@ -250,21 +674,7 @@ def process_recipe_extraction(recipe_id: str, url: str, user_id: str) -> Dict:
         logger.error(f"Recipe extraction failed: {e}", exc_info=True)
 
         # Update status to failed
-        try:
-            if supabase is None:
-                supabase = get_supabase_client()
-            supabase.table("recipes").update({
-                "status": "failed"
-            }).eq("id", recipe_id).execute()
-        except Exception as update_error:
-            logger.error(f"Failed to update recipe status to failed: {update_error}")
+        await mark_recipe_failed(recipe_id)
 
         raise
 
-
-def update_recipe_status(supabase, recipe_id: str, status: str):
-    """Helper to update recipe status."""
-    logger.info(f"Status update: {recipe_id} -> {status}")
-    supabase.table("recipes").update({
-        "status": status
-    }).eq("id", recipe_id).execute()
@@ -6,15 +6,27 @@ Usage:
     cd recipe-extraction
     python recipe_worker.py
 
+Tuning:
+    WORKER_CONCURRENCY  Jobs processed at once by each process (default 4)
+    WORKER_PROCESSES    Independent worker processes to fork, e.g. one per
+                        CPU core for ffmpeg-heavy loads (default 1)
+    WORKER_MAX_JOB_ATTEMPTS
+                        Deliveries a job may get before a worker crash
+                        mid-job marks its recipe failed (default 3)
+
 This worker uses a simple JSON-based queue that's compatible with the
-TypeScript enqueuing from the Next.js API routes.
+TypeScript enqueuing from the Next.js API routes. Payloads may also be
+zstd-compressed JSON (see payloads.py).
 """
-import json
+import asyncio
+import hashlib
+import multiprocessing
 import os
 import sys
 import logging
 import signal
-import time
+import socket
+import uuid
 
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -23,9 +35,16 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 extraction_path = os.path.join(os.path.dirname(__file__), '..', 'extraction')
 sys.path.insert(0, extraction_path)
 
-from redis import Redis
+import redis.asyncio as aioredis
+
+# uvloop is a faster drop-in event loop; fall back to asyncio's default loop if missing
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional speedup
+    uvloop = None
 
-from recipe_processor import process_recipe_extraction
+from payloads import decode_payload
+from recipe_processor import mark_recipe_failed, process_recipe_extraction
 from config import get_redis_url
 
 # Configure logging
@@ -38,6 +57,26 @@ logger = logging.getLogger(__name__)
 # Queue name must match TypeScript
 QUEUE_NAME = "recipe-extraction-jobs"
 
+# Number of jobs processed concurrently by this worker
+CONCURRENCY = int(os.environ.get("WORKER_CONCURRENCY", "4"))
+
+# Number of worker processes; each is an independent consumer of the same queue
+PROCESSES = int(os.environ.get("WORKER_PROCESSES", "1"))
+
+# Jobs in progress are parked on a per-worker processing list until they finish.
+# A worker's liveness key expires if it dies; on every heartbeat one live worker
+# (holding REAPER_LOCK_KEY) returns such orphaned lists to the queue.
+PROCESSING_PREFIX = f"{QUEUE_NAME}:processing:"
+LIVENESS_PREFIX = f"{QUEUE_NAME}:worker:"
+LIVENESS_TTL_SECONDS = 30
+REAPER_LOCK_KEY = f"{QUEUE_NAME}:reaper"
+
+# Times each job was orphaned by a dead worker, keyed by a hash of its payload.
+# A job orphaned MAX_JOB_ATTEMPTS times is assumed to crash the worker: it is
+# dropped and its recipe marked failed instead of being requeued again.
+DELIVERIES_KEY = f"{QUEUE_NAME}:deliveries"
+MAX_JOB_ATTEMPTS = int(os.environ.get("WORKER_MAX_JOB_ATTEMPTS", "3"))
+
 # Global flag for graceful shutdown
 running = True
 
@@ -45,11 +84,11 @@ running = True
 def signal_handler(signum, frame):
     """Handle shutdown signals."""
     global running
-    logger.info("Received shutdown signal, finishing current job...")
+    logger.info("Received shutdown signal, finishing current jobs...")
     running = False
 
 
-def process_job(job_data: dict) -> None:
+async def process_job(job_data: dict) -> None:
     """
     Process a single job from the queue.
 
@@ -68,67 +107,305 @@ def process_job(job_data: dict) -> None:
     logger.info(f"URL: {url}")
 
     try:
-        result = process_recipe_extraction(recipe_id, url, user_id)
+        result = await process_recipe_extraction(recipe_id, url, user_id)
         logger.info(f"Job completed successfully: {result}")
     except Exception as e:
         logger.error(f"Job failed: {e}", exc_info=True)
 
 
-def main():
-    """Start the worker to process recipe extraction jobs."""
-    global running
+async def heartbeat(redis_conn, worker_id: str) -> None:
+    """
+    Refresh this worker's liveness key and reap dead workers' jobs until cancelled.
 
-    # Set up signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    Runs until after the last job finishes. Reaping on every tick means jobs of a
+    worker that crashed and restarted under a new id are recovered once the old
+    liveness key expires, not only when another worker happens to start.
+    """
+    key = f"{LIVENESS_PREFIX}{worker_id}"
+    while True:
+        try:
+            await redis_conn.set(key, "1", ex=LIVENESS_TTL_SECONDS)
+            await requeue_orphaned_jobs(redis_conn, worker_id)
+        except Exception as e:
+            logger.warning(f"Heartbeat failed: {e}")
+        await asyncio.sleep(LIVENESS_TTL_SECONDS / 3)
+
+
+def _job_digest(job_json: bytes) -> str:
+    """Key a job in DELIVERIES_KEY by its payload, which is unchanged across requeues."""
+    return hashlib.sha1(job_json).hexdigest()
+
+
+async def _drop_poison_job(redis_conn, processing_key: bytes, job_json: bytes, digest: str) -> None:
+    """Remove a job that keeps killing workers and mark its recipe failed."""
+    await redis_conn.lrem(processing_key, 1, job_json)
+    await redis_conn.hdel(DELIVERIES_KEY, digest)
+
+    try:
+        recipe_id = decode_payload(job_json).get('recipe_id')
+    except ValueError:
+        recipe_id = None
+
+    logger.error(
+        f"Dropping job for recipe {recipe_id} after {MAX_JOB_ATTEMPTS} attempts that never finished"
+    )
+    if recipe_id:
+        await mark_recipe_failed(recipe_id)
+
+
+async def requeue_orphaned_jobs(redis_conn, worker_id: str) -> None:
+    """
+    Return jobs left on processing lists of dead workers to the head of the queue.
+
+    Only one worker reaps at a time (REAPER_LOCK_KEY). Each reclaimed job has
+    its attempt count bumped; jobs that reach MAX_JOB_ATTEMPTS are dropped
+    rather than requeued, so a job that crashes the worker cannot loop forever.
+
+    Args:
+        redis_conn: Shared asyncio Redis connection
+        worker_id: This worker's id, stored as the reaper lock owner
+    """
+    if not await redis_conn.set(REAPER_LOCK_KEY, worker_id, nx=True, ex=LIVENESS_TTL_SECONDS):
+        return
+
+    try:
+        async for processing_key in redis_conn.scan_iter(match=f"{PROCESSING_PREFIX}*"):
+            dead_worker_id = processing_key.decode('utf-8')[len(PROCESSING_PREFIX):]
+            if await redis_conn.exists(f"{LIVENESS_PREFIX}{dead_worker_id}"):
+                continue
+
+            # Work from the tail to the head so requeued jobs keep their original order
+            requeued = 0
+            while True:
+                job_json = await redis_conn.lindex(processing_key, -1)
+                if job_json is None:
+                    break
+
+                digest = _job_digest(job_json)
+                attempts = await redis_conn.hincrby(DELIVERIES_KEY, digest, 1)
+                if attempts >= MAX_JOB_ATTEMPTS:
+                    await _drop_poison_job(redis_conn, processing_key, job_json, digest)
+                    continue
+
+                await redis_conn.lmove(processing_key, QUEUE_NAME, "RIGHT", "LEFT")
+                requeued += 1
+
+            if requeued:
+                logger.warning(f"Requeued {requeued} orphaned job(s) from worker {dead_worker_id}")
+    finally:
+        await redis_conn.delete(REAPER_LOCK_KEY)
+
+
+async def _return_job(redis_conn, processing_key: str, job_json: bytes) -> None:
+    """Move a job that was pulled but never started back to the head of the queue."""
+    async with redis_conn.pipeline(transaction=True) as pipe:
+        pipe.lrem(processing_key, 1, job_json)
+        pipe.lpush(QUEUE_NAME, job_json)
+        await pipe.execute()
+    logger.info("Returned unstarted job to the queue")
+
+
+async def prefetcher(redis_conn, processing_key: str, jobs: asyncio.Queue, slots: asyncio.Semaphore) -> None:
+    """
+    Keep the next job pulled from Redis while the worker loops are busy.
+
+    A slot is taken before each BLMOVE and given back when a job finishes, so
+    at most CONCURRENCY jobs are in progress plus one waiting in `jobs`.
+    Jobs are moved atomically onto this worker's processing list (BLMOVE), so
+    a crash mid-job leaves them recoverable instead of lost. On shutdown, jobs
+    that were pulled but not started go back to the queue.
+
+    Args:
+        redis_conn: Shared asyncio Redis connection
+        processing_key: This worker's processing list
+        jobs: Local hand-off queue read by the worker loops
+        slots: Semaphore sized CONCURRENCY + 1
+    """
+    while running:
+        await slots.acquire()
+        if not running:
+            slots.release()
+            break
+
+        try:
+            # BLMOVE blocks until a job is available (timeout 5 seconds, to notice shutdown)
+            job_json = await redis_conn.blmove(QUEUE_NAME, processing_key, 5, "LEFT", "RIGHT")
+        except Exception as e:
+            slots.release()
+            if running:
+                logger.error(f"Error in prefetcher: {e}", exc_info=True)
+                # Brief pause before retrying
+                await asyncio.sleep(1)
+            continue
+
+        if job_json is None:
+            # Timeout, no job available, continue loop
+            slots.release()
+            continue
+
+        logger.info(f"Received job from queue: {QUEUE_NAME}")
+
+        # The worker loops stop reading `jobs` on shutdown, so never block on put()
+        # past that point; a job that cannot be handed over goes straight back
+        handed_over = False
+        while running and not handed_over:
+            try:
+                await asyncio.wait_for(jobs.put(job_json), timeout=1)
+                handed_over = True
+            except asyncio.TimeoutError:
+                continue
+
+        if not handed_over:
+            slots.release()
+            await _return_job(redis_conn, processing_key, job_json)
+
+    # Return jobs that were prefetched but never started, ahead of newer ones
+    while not jobs.empty():
+        await _return_job(redis_conn, processing_key, jobs.get_nowait())
+
+
+async def worker_loop(
+    worker_id: int,
+    redis_conn,
+    processing_key: str,
+    jobs: asyncio.Queue,
+    slots: asyncio.Semaphore
+) -> None:
+    """
+    Take prefetched jobs and process them one at a time until shutdown.
+
+    Several loops run side by side on one event loop, so one job waiting on
+    a download or Whisper does not hold up the others.
 
+    Args:
+        worker_id: Index of this loop, for logging
+        redis_conn: Shared asyncio Redis connection
+        processing_key: This worker's processing list; finished jobs are removed from it
+        jobs: Local hand-off queue filled by the prefetcher
+        slots: Semaphore released when a job finishes
+    """
+    while running:
+        try:
+            job_json = await asyncio.wait_for(jobs.get(), timeout=1)
+        except asyncio.TimeoutError:
+            continue
+
+        logger.info(f"[worker {worker_id}] Starting job")
+        try:
+            job_data = decode_payload(job_json)
+            await process_job(job_data)
+        except ValueError as e:
+            logger.error(f"Failed to parse job JSON: {e}")
+            logger.error(f"Raw data: {job_json}")
+        except Exception as e:
+            logger.error(f"Error in worker loop: {e}", exc_info=True)
+        finally:
+            slots.release()
+
+        try:
+            async with redis_conn.pipeline(transaction=False) as pipe:
+                pipe.lrem(processing_key, 1, job_json)
+                pipe.hdel(DELIVERIES_KEY, _job_digest(job_json))
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Failed to clear finished job from {processing_key}: {e}")
+
+
+async def run_worker() -> None:
+    """Connect to Redis and run the prefetcher plus CONCURRENCY worker loops until shutdown."""
     redis_url = get_redis_url()
 
     logger.info(f"Connecting to Redis: {redis_url}")
-    redis_conn = Redis.from_url(redis_url, decode_responses=True)
+    # Payloads stay bytes: they may be zstd-compressed (see payloads.py)
+    redis_conn = aioredis.from_url(redis_url, decode_responses=False)
 
     # Test Redis connection
     try:
-        redis_conn.ping()
+        await redis_conn.ping()
         logger.info("Redis connection successful")
     except Exception as e:
         logger.error(f"Failed to connect to Redis: {e}")
         logger.error("Make sure Redis is running: docker-compose up -d")
         sys.exit(1)
 
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    processing_key = f"{PROCESSING_PREFIX}{worker_id}"
+
+    # Mark this worker live before pulling jobs, so no reaper mistakes its list for orphaned
+    await redis_conn.set(f"{LIVENESS_PREFIX}{worker_id}", "1", ex=LIVENESS_TTL_SECONDS)
+
     logger.info("=" * 50)
     logger.info("Recipe Extraction Worker Started")
     logger.info(f"Listening on queue: {QUEUE_NAME}")
+    logger.info(f"Worker ID: {worker_id}")
+    logger.info(f"Concurrency: {CONCURRENCY}")
     logger.info("Press Ctrl+C to stop")
     logger.info("=" * 50)
 
-    while running:
-        try:
-            # BLPOP blocks until a job is available (timeout 5 seconds)
-            result = redis_conn.blpop(QUEUE_NAME, timeout=5)
+    jobs: asyncio.Queue = asyncio.Queue(maxsize=1)
+    slots = asyncio.Semaphore(CONCURRENCY + 1)
 
-            if result is None:
-                # Timeout, no job available, continue loop
-                continue
+    heartbeat_task = asyncio.create_task(heartbeat(redis_conn, worker_id))
 
-            queue_name, job_json = result
-            logger.info(f"Received job from queue: {queue_name}")
+    try:
+        await asyncio.gather(
+            prefetcher(redis_conn, processing_key, jobs, slots),
+            *[
+                worker_loop(loop_id, redis_conn, processing_key, jobs, slots)
+                for loop_id in range(CONCURRENCY)
+            ]
+        )
+    finally:
+        heartbeat_task.cancel()
+        try:
+            await redis_conn.delete(f"{LIVENESS_PREFIX}{worker_id}")
+        except Exception as e:
+            logger.warning(f"Failed to clear liveness key: {e}")
+        await redis_conn.aclose()
 
-            try:
-                job_data = json.loads(job_json)
-                process_job(job_data)
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse job JSON: {e}")
-                logger.error(f"Raw data: {job_json}")
 
-        except Exception as e:
-            if running:
-                logger.error(f"Error in worker loop: {e}", exc_info=True)
-                # Brief pause before retrying
-                time.sleep(1)
+def run_process():
+    """Run one worker process: its own event loop, Redis connection and jobs."""
+    # Set up signal handlers
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    if uvloop is not None:
+        uvloop.run(run_worker())
+    else:
+        asyncio.run(run_worker())
 
     logger.info("Worker shutdown complete")
 
 
+def main():
+    """Start the worker to process recipe extraction jobs."""
+    if PROCESSES <= 1:
+        run_process()
+        return
+
+    children = [
+        multiprocessing.Process(target=run_process, name=f"recipe-worker-{index}")
+        for index in range(PROCESSES)
+    ]
+
+    def forward_signal(signum, frame):
+        """Ask every child to finish its current jobs and exit."""
+        logger.info("Received shutdown signal, stopping worker processes...")
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signal.SIGTERM)
+
+    for child in children:
+        child.start()
+
+    signal.signal(signal.SIGINT, forward_signal)
+    signal.signal(signal.SIGTERM, forward_signal)
+
+    logger.info(f"Started {PROCESSES} worker processes")
+    for child in children:
+        child.join()
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,47 @@
+-- Description: Single-call finalization of an extracted recipe
+-- The Python worker previously issued three writes at the end of each job
+-- (recipes update, ingredients insert, instructions insert). finalize_recipe
+-- does all three in one transaction, so a job costs one round-trip and can
+-- never leave a recipe half-written.
+--
+-- Only keys present in the recipe JSON are updated. Existing ingredients and
+-- instructions are replaced, so re-running a job does not duplicate rows.
+
+CREATE OR REPLACE FUNCTION finalize_recipe(
+  recipe_id UUID,
+  recipe JSONB,
+  ingredients JSONB,
+  instructions JSONB
+)
+RETURNS VOID AS $$
+BEGIN
+  UPDATE recipes r SET
+    title = CASE WHEN recipe ? 'title' THEN recipe->>'title' ELSE r.title END,
+    description = CASE WHEN recipe ? 'description' THEN recipe->>'description' ELSE r.description END,
+    prep_time_minutes = CASE WHEN recipe ? 'prep_time_minutes' THEN (recipe->>'prep_time_minutes')::INTEGER ELSE r.prep_time_minutes END,
+    cook_time_minutes = CASE WHEN recipe ? 'cook_time_minutes' THEN (recipe->>'cook_time_minutes')::INTEGER ELSE r.cook_time_minutes END,
+    servings = CASE WHEN recipe ? 'servings' THEN (recipe->>'servings')::INTEGER ELSE r.servings END,
+    cuisine = CASE WHEN recipe ? 'cuisine' THEN recipe->>'cuisine' ELSE r.cuisine END,
+    platform = CASE WHEN recipe ? 'platform' THEN recipe->>'platform' ELSE r.platform END,
+    thumbnail_url = CASE WHEN recipe ? 'thumbnail_url' THEN recipe->>'thumbnail_url' ELSE r.thumbnail_url END,
+    status = CASE WHEN recipe ? 'status' THEN recipe->>'status' ELSE r.status END
+  WHERE r.id = finalize_recipe.recipe_id;
+
+  DELETE FROM ingredients ing WHERE ing.recipe_id = finalize_recipe.recipe_id;
+  DELETE FROM instructions ins WHERE ins.recipe_id = finalize_recipe.recipe_id;
+
+  INSERT INTO ingredients (recipe_id, raw_text, item, quantity, unit, order_index)
+  SELECT finalize_recipe.recipe_id, i.raw_text, i.item, i.quantity, i.unit, i.order_index
+  FROM jsonb_to_recordset(COALESCE(finalize_recipe.ingredients, '[]'::jsonb))
+    AS i(raw_text TEXT, item TEXT, quantity FLOAT, unit TEXT, order_index INTEGER);
+
+  INSERT INTO instructions (recipe_id, step_number, text)
+  SELECT finalize_recipe.recipe_id, s.step_number, s."text"
+  FROM jsonb_to_recordset(COALESCE(finalize_recipe.instructions, '[]'::jsonb))
+    AS s(step_number INTEGER, "text" TEXT);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Only the worker (service role) finalizes recipes
+REVOKE EXECUTE ON FUNCTION finalize_recipe(UUID, JSONB, JSONB, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION finalize_recipe(UUID, JSONB, JSONB, JSONB) TO service_role;